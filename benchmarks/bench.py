@@ -0,0 +1,157 @@
+"""Time common RoamGraph operations on synthetic collections.
+
+Collections are generated with ``benchmarks.corpus`` and kept in a work
+directory, so later runs only pay for generation once per size. Results are
+printed as a table and can be written as JSON for comparison between runs::
+
+  python -m benchmarks.bench --sizes 1000 10000 100000 --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.corpus import CORPUS_VERSION, DOMAINS, CorpusSpec, generate_corpus
+from orgroamtools.data import RoamGraph
+from orgroamtools._utils import ORG_FILE_CACHE
+
+BENCHMARKS = (
+    "init",
+    "filter_tags",
+    "remove_orphans",
+    "refresh",
+    "body_index",
+    "node_by_id",
+    "node_by_title",
+    "misc_links",
+    "link_domains",
+    "nodes_linking_to",
+)
+
+LOOKUPS = 1000
+
+
+def corpus_db(workdir: str, size: int, seed: int) -> str:
+    """Return database of a collection of ``size`` nodes, generating it if needed"""
+    directory = os.path.join(workdir, f"corpus-v{CORPUS_VERSION}-{size}-{seed}")
+    db = os.path.join(directory, "org-roam.db")
+    if not os.path.exists(db):
+        generate_corpus(directory, CorpusSpec(nodes=size, seed=seed))
+    return db
+
+
+def timed(setup, run, repeat: int) -> list[float]:
+    """Return wall times of ``repeat`` calls of ``run(setup())``
+
+    Only ``run`` is timed, so state it consumes can be rebuilt by ``setup``.
+    """
+    times = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        run(arg)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def bench_size(db: str, benchmarks: list[str], repeat: int, seed: int) -> dict:
+    """Return timings of ``benchmarks`` on the collection stored in ``db``"""
+    collection = RoamGraph(db)
+    rng = random.Random(seed)
+    IDs = rng.sample(collection.IDs, min(LOOKUPS, len(collection.IDs)))
+    titles = [collection.node_title(ID) for ID in IDs]
+    tag = max(collection.all_tags(), key=lambda t: len(collection.select([t])))
+
+    def fresh():
+        return RoamGraph(db)
+
+    def cold_cache():
+        ORG_FILE_CACHE.cache_clear()
+        return collection
+
+    cases = {
+        "init": (lambda: db, RoamGraph),
+        "filter_tags": (lambda: collection, lambda c: c.filter_tags([tag])),
+        "remove_orphans": (fresh, lambda c: c.remove_orphans()),
+        "refresh": (fresh, lambda c: c.refresh()),
+        "body_index": (cold_cache, lambda c: c.body_index),
+        "node_by_id": (lambda: collection, lambda c: [c.node(ID) for ID in IDs]),
+        "node_by_title": (lambda: collection, lambda c: [c.node(t) for t in titles]),
+        "misc_links": (fresh, lambda c: c.misc_links),
+        "link_domains": (lambda: collection, lambda c: c.link_domains()),
+        "nodes_linking_to": (
+            lambda: collection,
+            lambda c: c.nodes_linking_to(DOMAINS[0]),
+        ),
+    }
+    results = {}
+    for name in benchmarks:
+        times = timed(*cases[name], repeat)
+        results[name] = {
+            "best_s": min(times),
+            "mean_s": statistics.fmean(times),
+            "repeat": repeat,
+        }
+        if name.startswith("node_by"):
+            results[name]["per_call_s"] = min(times) / len(IDs)
+    tracemalloc.start()
+    loaded = RoamGraph(db)
+    final, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    phases = {}
+    for phase in loaded.load_stats:
+        phases[phase.phase] = phases.get(phase.phase, 0) + phase.seconds
+    return {
+        "nodes": collection.size[0],
+        "links": collection.size[1],
+        "init_phases_s": phases,
+        "init_peak_bytes": peak,
+        "init_final_bytes": final,
+        **results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    parser.add_argument(
+        "--benchmarks", nargs="+", choices=BENCHMARKS, default=BENCHMARKS
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--workdir", default=os.path.join(tempfile.gettempdir(), "orgroamtools-bench")
+    )
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": {},
+    }
+    for size in args.sizes:
+        db = corpus_db(args.workdir, size, args.seed)
+        results = bench_size(db, list(args.benchmarks), args.repeat, args.seed)
+        report["results"][str(size)] = results
+        for name in args.benchmarks:
+            print(f"{size:>8} {name:<16} {results[name]['best_s'] * 1000:>10.2f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
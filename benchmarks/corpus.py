@@ -0,0 +1,302 @@
+"""Generate synthetic org-roam collections.
+
+Writes ``.org`` files together with an org-roam v2 database describing them,
+laid out the way ``org-roam-db-sync`` would: every file has a file level node
+followed by heading nodes, links between nodes are ``id:`` links in the bodies,
+every link of a body has a row in the ``links`` table, heading nodes inherit the
+``#+filetags`` of their file, and values in the database are stored as quoted
+lisp strings.
+
+Run as a script to write a collection::
+
+  python -m benchmarks.corpus OUTPUT_DIR --nodes 10000
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+import uuid
+from dataclasses import asdict, dataclass
+
+SCHEMA = """
+CREATE TABLE files (file UNIQUE PRIMARY KEY, title , hash NOT NULL, atime NOT NULL, mtime NOT NULL);
+CREATE TABLE nodes (id NOT NULL PRIMARY KEY, file NOT NULL, level NOT NULL, pos NOT NULL, todo , priority , scheduled text, deadline text, title , properties , olp , FOREIGN KEY (file) REFERENCES files (file) ON DELETE CASCADE);
+CREATE TABLE aliases (node_id NOT NULL, alias , FOREIGN KEY (node_id) REFERENCES nodes (id) ON DELETE CASCADE);
+CREATE TABLE citations (node_id NOT NULL, cite_key NOT NULL, pos NOT NULL, properties , FOREIGN KEY (node_id) REFERENCES nodes (id) ON DELETE CASCADE);
+CREATE TABLE refs (node_id NOT NULL, ref NOT NULL, type NOT NULL, FOREIGN KEY (node_id) REFERENCES nodes (id) ON DELETE CASCADE);
+CREATE TABLE tags (node_id NOT NULL, tag , FOREIGN KEY (node_id) REFERENCES nodes (id) ON DELETE CASCADE);
+CREATE TABLE links (pos NOT NULL, source NOT NULL, dest NOT NULL, type NOT NULL, properties NOT NULL, FOREIGN KEY (source) REFERENCES nodes (id) ON DELETE CASCADE);
+CREATE INDEX alias_node_id ON aliases (node_id );
+CREATE INDEX refs_node_id ON refs (node_id );
+CREATE INDEX tags_node_id ON tags (node_id );
+"""
+
+WORDS = (
+    "category functor group ring module field space map object morphism limit "
+    "colimit sheaf scheme algebra operad monoid lattice graph vertex edge path "
+    "proof lemma theorem example definition remark note idea question answer "
+    "the of and a to in is that for with as on by this be are from"
+).split()
+
+# Bump whenever generated collections change, so cached ones are regenerated
+CORPUS_VERSION = 2
+
+DOMAINS = ("arxiv.org", "en.wikipedia.org", "doi.org", "github.com", "example.org")
+
+
+@dataclass
+class CorpusSpec:
+    """
+    Parameters of a synthetic collection.
+
+    Attributes
+    ----------
+    nodes : ``int``
+        Total number of nodes
+    links_per_node : ``float``
+        Mean number of ``id:`` links in the body of a node
+    tags : ``int``
+        Number of distinct tags
+    tags_per_node : ``float``
+        Mean number of tags on a node
+    tag_skew : ``float``
+        Exponent of the Zipf law tags are drawn from; larger values make a few
+        tags much more common than the rest
+    headings_per_file : ``int``
+        Number of heading nodes in each file, besides the file level node
+    body_words : ``int``
+        Mean number of words in the body of a node
+    seed : ``int``
+        Seed of the random generator, so collections are reproducible
+    """
+
+    nodes: int = 1000
+    links_per_node: float = 3.0
+    tags: int = 20
+    tags_per_node: float = 1.5
+    tag_skew: float = 1.1
+    headings_per_file: int = 4
+    body_words: int = 80
+    seed: int = 0
+
+
+def quoted(s: str) -> str:
+    """Return ``s`` quoted the way org-roam stores strings"""
+    return '"' + s.replace('"', '\\"') + '"'
+
+
+def _pick_tags(
+    rng: random.Random, spec: CorpusSpec, tag_names: list[str], weights: list[float]
+) -> list[str]:
+    """Return tags of a node, drawn from the Zipf law given by ``weights``"""
+    count = min(len(tag_names), int(rng.expovariate(1 / spec.tags_per_node) + 0.5))
+    return sorted(set(rng.choices(tag_names, weights, k=count)))
+
+
+def _body(
+    rng: random.Random, spec: CorpusSpec, links: list[tuple[str, str]]
+) -> tuple[str, list[str]]:
+    """Return paragraph of filler text with the given ``(ID, TITLE)`` links
+
+    Some paragraphs also get a web link, whose target is returned as org-roam
+    stores it in the ``links`` table, e.g. ``//arxiv.org/abs/12``.
+    """
+    words = rng.choices(WORDS, k=max(1, int(rng.gauss(spec.body_words, 10))))
+    for ID, title in links:
+        words.insert(rng.randrange(len(words) + 1), f"[[id:{ID}][{title}]]")
+    lines = [" ".join(words[i : i + 12]) for i in range(0, len(words), 12)]
+
+    web_links = []
+    extra = rng.random()
+    if extra < 0.1:
+        lines.append(r"\[")
+        lines.append(r"\sum_{i=1}^{n} x_i = " + str(rng.randrange(100)))
+        lines.append(r"\]")
+    elif extra < 0.15:
+        lines.append("#+begin_src python :results output")
+        lines.append(f"print({rng.randrange(100)})")
+        lines.append("#+end_src")
+    elif extra < 0.2:
+        web_links.append(f"//{rng.choice(DOMAINS)}/{rng.randrange(1000)}")
+        lines.append(f"[[https:{web_links[-1]}][reference]]")
+    return "\n".join(lines) + "\n", web_links
+
+
+def open_database(db: str) -> sqlite3.Connection:
+    """Create an empty org-roam database, replacing any file at ``db``
+
+    Parameters
+    ----------
+    db : ``str``
+        Path of the database
+
+    Returns
+    -------
+    ``sqlite3.Connection``
+        Connection to the new database, to be filled with ``insert_file``
+    """
+    if os.path.exists(db):
+        os.remove(db)
+    con = sqlite3.connect(db)
+    con.executescript(SCHEMA)
+    return con
+
+
+def insert_file(
+    con: sqlite3.Connection,
+    fname: str,
+    text: str,
+    nodes: list[tuple[str, int, int, str]],
+    tags: list[tuple[str, str]],
+    links: list[tuple[int, str, str, str]],
+) -> None:
+    """Record a file and its nodes in an org-roam database
+
+    Values are quoted the way org-roam stores them, and the hash of the file is
+    taken from ``text``.
+
+    Parameters
+    ----------
+    con : ``sqlite3.Connection``
+        Connection to the database
+    fname : ``str``
+        Absolute path of the file
+    text : ``str``
+        Contents of the file
+    nodes : ``list[tuple[str, int, int, str]]``
+        ``(ID, LEVEL, POS, TITLE)`` of the nodes in the file, file node first
+    tags : ``list[tuple[str, str]]``
+        ``(ID, TAG)`` of every tag of the nodes, inherited ones included
+    links : ``list[tuple[int, str, str, str]]``
+        ``(POS, SOURCE, DEST, TYPE)`` of every link made by the nodes
+    """
+    stamp = "(0 0 0 0)"
+    title = nodes[0][3] if nodes else ""
+    con.execute(
+        "INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+        (
+            quoted(fname),
+            quoted(title),
+            quoted(hashlib.sha1(text.encode()).hexdigest()),
+            stamp,
+            stamp,
+        ),
+    )
+    con.executemany(
+        "INSERT INTO nodes (id, file, level, pos, title) VALUES (?, ?, ?, ?, ?)",
+        [
+            (quoted(ID), quoted(fname), level, pos, quoted(node_title))
+            for ID, level, pos, node_title in nodes
+        ],
+    )
+    con.executemany(
+        "INSERT INTO tags VALUES (?, ?)",
+        [(quoted(ID), quoted(tag)) for ID, tag in tags],
+    )
+    con.executemany(
+        "INSERT INTO links VALUES (?, ?, ?, ?, '()')",
+        [
+            (pos, quoted(source), quoted(dest), quoted(link_type))
+            for pos, source, dest, link_type in links
+        ],
+    )
+
+
+def generate_corpus(directory: str, spec: CorpusSpec = None) -> str:
+    """Write a synthetic collection and its org-roam database
+
+    Parameters
+    ----------
+    directory : ``str``
+        Directory to write the ``.org`` files and ``org-roam.db`` into. It is
+        created if it does not exist
+    spec : ``CorpusSpec``
+        Shape of the collection, defaults to ``CorpusSpec()``
+
+    Returns
+    -------
+    ``str``
+        Path to the written database
+    """
+    spec = spec or CorpusSpec()
+    rng = random.Random(spec.seed)
+    os.makedirs(directory, exist_ok=True)
+
+    IDs = [
+        str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(spec.nodes)
+    ]
+    titles = [f"{rng.choice(WORDS).title()} {i}" for i in range(spec.nodes)]
+    tag_names = [f"tag{i}" for i in range(spec.tags)]
+    tag_weights = [1 / (i + 1) ** spec.tag_skew for i in range(spec.tags)]
+    per_file = spec.headings_per_file + 1
+
+    db = os.path.join(directory, "org-roam.db")
+    con = open_database(db)
+
+    for start in range(0, spec.nodes, per_file):
+        fname = os.path.abspath(os.path.join(directory, f"node{start}.org"))
+        members = range(start, min(start + per_file, spec.nodes))
+        text = ""
+        node_rows, tag_rows, link_rows = [], [], []
+        file_tags = []
+        for level_index, i in enumerate(members):
+            # Preferential attachment: low indices collect most of the links
+            targets = {
+                int(spec.nodes * rng.random() ** 2)
+                for _ in range(int(rng.expovariate(1 / spec.links_per_node) + 0.5))
+            } - {i}
+            tags = _pick_tags(rng, spec, tag_names, tag_weights)
+            level = 0 if level_index == 0 else 1
+            pos = len(text) + 1
+            if level == 0:
+                text += f":PROPERTIES:\n:ID: {IDs[i]}\n:END:\n#+title: {titles[i]}\n"
+                if tags:
+                    text += f"#+filetags: :{':'.join(tags)}:\n"
+                text += "\n"
+                file_tags = tags
+            else:
+                tag_suffix = f" :{':'.join(tags)}:" if tags else ""
+                text += f"* {titles[i]}{tag_suffix}\n"
+                text += f":PROPERTIES:\n:ID: {IDs[i]}\n:END:\n"
+                # org-roam records the tags headings inherit from #+filetags
+                tags = sorted(set(tags) | set(file_tags))
+            body_start = len(text)
+            body, web_links = _body(
+                rng, spec, [(IDs[t], titles[t]) for t in sorted(targets)]
+            )
+            text += body
+
+            node_rows.append((IDs[i], level, pos, titles[i]))
+            tag_rows.extend((IDs[i], tag) for tag in tags)
+            link_rows.extend(
+                (body_start + 1, IDs[i], IDs[t], "id") for t in sorted(targets)
+            )
+            link_rows.extend(
+                (body_start + 1, IDs[i], dest, "https") for dest in web_links
+            )
+
+        with open(fname, "w") as f:
+            f.write(text)
+        insert_file(con, fname, text, node_rows, tag_rows, link_rows)
+
+    con.commit()
+    con.close()
+    return db
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory")
+    for name, default in asdict(CorpusSpec()).items():
+        parser.add_argument(
+            f"--{name.replace('_', '-')}", type=type(default), default=default
+        )
+    args = vars(parser.parse_args(argv))
+    directory = args.pop("directory")
+    print(generate_corpus(directory, CorpusSpec(**args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,29 @@
 from enum import Enum
-from typing import Tuple
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+from types import BuiltinFunctionType, FunctionType, ModuleType
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+import importlib
+import importlib.util
+import json
+import logging
+import mmap
+import os
 import re
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+import urllib.parse
 import orgparse as op
 
+logger = logging.getLogger("orgroamtools")
+
 ORG_LATEX_RX = (
     r"\\\((.*?)\\\)|"  #  \(\)
     r"\\\[\n(.*?)\n\\\]|"  # \[...\]
@@ -11,11 +32,28 @@ ORG_LATEX_RX = (
     r"#\+begin_latex\n(.*?)#\+end_latex"  # Org-mode latex block
 )
 
+ORG_LATEX_RE = re.compile(ORG_LATEX_RX, re.DOTALL)
+
 SRC_BLOCK_RE = re.compile(
     r"^\s*#\+BEGIN_SRC\s+([a-zA-Z0-9_-]+)(?:.*?)\n(.*?)#\+END_SRC\s*",
     re.MULTILINE | re.DOTALL | re.IGNORECASE,
 )
 
+# Every construct ``scan_body`` extracts, as one alternation. Source blocks come
+# first so that nothing inside a block is mistaken for math or a link
+BODY_SCAN_RE = re.compile(
+    r"(?P<src>(?i:^[ \t]*#\+BEGIN_SRC[ \t]+(?P<lang>[a-zA-Z0-9_-]+)(?P<args>[^\n]*)\n"
+    r"(?P<code>.*?)#\+END_SRC)[^\n]*)|"
+    r"(?P<math>" + ORG_LATEX_RX + r")|"
+    r"(?P<link>\[\[(?P<target>[^\]]+)\](?:\[(?P<desc>[^\]]*)\])?\])|"
+    r"(?P<heading>^(?P<stars>\*+)[ \t]+(?P<title>[^\n]*))",
+    re.MULTILINE | re.DOTALL,
+)
+_MATH_GROUPS = range(
+    BODY_SCAN_RE.groupindex["math"] + 1, BODY_SCAN_RE.groupindex["link"]
+)
+LINK_TYPE_RE = re.compile(r"([a-zA-Z][a-zA-Z0-9+.-]*):(.*)", re.DOTALL)
+
 
 class IdentifierType(Enum):
     """
@@ -60,6 +98,110 @@ class DuplicateTitlesWarning(Warning):
         return repr(self.message)
 
 
+def import_optional(name: str, feature: str) -> ModuleType:
+    """Import an optional dependency
+
+    Parameters
+    ----------
+    name : ``str``
+        Name of module to import
+    feature : ``str``
+        Name of the feature needing the module, used in the error message
+
+    Returns
+    -------
+    ``ModuleType``
+        Imported module
+
+    Raises
+    ------
+    ``ImportError``
+        Raised if the module is not installed
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        raise ImportError(
+            f"{feature} requires the optional dependency {name}: pip install {name}"
+        ) from e
+
+
+def lazy_import(name: str) -> Optional[ModuleType]:
+    """Return an optional dependency that is only executed on first use
+
+    The module is registered in ``sys.modules`` but its code runs on the first
+    access of one of its attributes, so binding it costs nothing up front.
+
+    Parameters
+    ----------
+    name : ``str``
+        Name of module to import
+
+    Returns
+    -------
+    ``Optional[ModuleType]``
+        Module, ``None`` if it is not installed
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def deep_sizeof(objs: Iterable, seen: set[int]) -> int:
+    """Return total size of objects and everything they reference
+
+    Containers, ``__dict__`` and ``__slots__`` attributes are followed. Classes,
+    modules and functions are not.
+
+    Parameters
+    ----------
+    objs : ``Iterable``
+        Objects to measure
+    seen : ``set[int]``
+        ``id`` of objects already counted. Updated in place, so sharing it between
+        calls counts every object once
+
+    Returns
+    -------
+    ``int``
+        Size in bytes of the objects not already in ``seen``
+    """
+    skip = (type, ModuleType, FunctionType, BuiltinFunctionType)
+    stack = list(objs)
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, skip):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, (str, bytes, int, float, array)):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, "__dict__"):
+                stack.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                slots = getattr(cls, "__slots__", ())
+                for slot in (slots,) if isinstance(slots, str) else slots:
+                    if slot not in ("__dict__", "__weakref__") and hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return total
+
+
 def extract_math_snippets(text: str) -> list[str]:
     """Return math snippets in text
 
@@ -74,10 +216,7 @@ def extract_math_snippets(text: str) -> list[str]:
         List of math snippets
     """
     return [
-        group
-        for match in re.findall(ORG_LATEX_RX, text, re.DOTALL)
-        for group in match
-        if group
+        group for match in ORG_LATEX_RE.findall(text) for group in match if group
     ]
 
 
@@ -95,3 +234,919 @@ def extract_src_blocks(text: str) -> list[Tuple[str, str]]:
         List of source block environments in the form (LANGUAGE, SRC_BLOCK_BODY)
     """
     return [(match[0], match[1].strip()) for match in SRC_BLOCK_RE.findall(text)]
+
+
+SrcBlock = namedtuple("SrcBlock", ["language", "header_args", "body"])
+
+BodyContent = namedtuple("BodyContent", ["math", "src_blocks", "links", "headings"])
+
+
+def parse_header_args(args: str) -> dict[str, str]:
+    """Parse header arguments of a source block
+
+    Parameters
+    ----------
+    args : ``str``
+        Text following the language on a ``#+begin_src`` line,
+        e.g. ``":results output :exports both"``
+
+    Returns
+    -------
+    ``dict[str, str]``
+        dict with keys the argument names (with their colon) and values the
+        argument values. Switches before the first argument, like ``-n``, are
+        ignored
+    """
+    header_args = {}
+    key = None
+    for token in args.split():
+        if token.startswith(":"):
+            key = token
+            header_args[key] = ""
+        elif key is not None:
+            header_args[key] = f"{header_args[key]} {token}".lstrip()
+    return header_args
+
+
+def scan_body(text: str) -> BodyContent:
+    """Extract math snippets, source blocks, links and headings in one pass
+
+    Text inside source blocks is only reported as part of its block: math and
+    links in code are not extracted.
+
+    Parameters
+    ----------
+    text : ``str``
+        Text to scan, usually the body of a node
+
+    Returns
+    -------
+    ``BodyContent``
+        Named tuple ``(math, src_blocks, links, headings)`` of
+
+        - ``list[str]``: math snippets, as in ``extract_math_snippets``
+        - ``list[SrcBlock]``: ``(LANGUAGE, HEADER_ARGS, BODY)`` of every source
+          block, with ``HEADER_ARGS`` as in ``parse_header_args``
+        - ``list[Tuple[str, str, Optional[str]]]``: ``(TYPE, CONTENT, DESCRIPTION)``
+          of every bracket link, with type ``"fuzzy"`` for links without one
+        - ``list[Tuple[int, str]]``: ``(LEVEL, TITLE)`` of every heading
+    """
+    content = BodyContent([], [], [], [])
+    for match in BODY_SCAN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == "src":
+            content.src_blocks.append(
+                SrcBlock(
+                    match["lang"],
+                    parse_header_args(match["args"]),
+                    match["code"].strip(),
+                )
+            )
+        elif kind == "math":
+            content.math.extend(match[i] for i in _MATH_GROUPS if match[i])
+        elif kind == "link":
+            typed = LINK_TYPE_RE.fullmatch(match["target"])
+            link_type, link = typed.groups() if typed else ("fuzzy", match["target"])
+            content.links.append((link_type, link, match["desc"]))
+        else:
+            content.headings.append((len(match["stars"]), match["title"].strip()))
+    return content
+
+
+def subtree_index(fname: str) -> dict[str, op.node.OrgBaseNode]:
+    """Parse an org file into a map of IDs to subtrees
+
+    Parameters
+    ----------
+    fname : ``str``
+        Path of org file
+
+    Returns
+    -------
+    ``dict[str, orgparse.node.OrgBaseNode]``
+        dict with keys the IDs found in the file and values the first subtree
+        carrying that ID
+    """
+    index = dict()
+    for node in op.load(fname):
+        ID = node.get_property("ID")
+        if ID is not None:
+            index.setdefault(ID, node)
+    return index
+
+
+def file_bodies(
+    fname: str, node_ids: list[str], format: str = "plain"
+) -> dict[str, str]:
+    """Return bodies of several nodes living in the same org file
+
+    The file is parsed exactly once. This is a module level function so that it
+    can be shipped to worker processes.
+
+    Parameters
+    ----------
+    fname : ``str``
+        Path of org file
+    node_ids : ``list[str]``
+        IDs of nodes in the file
+    format : ``str``
+        Format of the body passed to ``orgparse``'s ``get_body``: ``"plain"``
+        renders links as their descriptions, ``"raw"`` keeps the org markup
+
+    Returns
+    -------
+    ``dict[str, str]``
+        dict with keys the node IDs and values their body text
+    """
+    index = subtree_index(fname)
+    return {
+        ID: "\n".join(subtree.get_body(format) for subtree in index.get(ID, []))
+        for ID in node_ids
+    }
+
+
+def file_contents(fname: str, node_ids: list[str]) -> dict[str, BodyContent]:
+    """Return scanned content of several nodes living in the same org file
+
+    The raw body of every node is scanned with ``scan_body``. Bodies do not hold
+    the heading lines of the node's subtree, so its headings are read from the
+    parsed subtrees instead.
+
+    Parameters
+    ----------
+    fname : ``str``
+        Path of org file
+    node_ids : ``list[str]``
+        IDs of nodes in the file
+
+    Returns
+    -------
+    ``dict[str, BodyContent]``
+        dict with keys the node IDs and values their scanned content
+    """
+    index = subtree_index(fname)
+    contents = dict()
+    for ID in node_ids:
+        subtrees = list(index.get(ID, []))
+        content = scan_body("\n".join(subtree.get_body("raw") for subtree in subtrees))
+        content.headings.extend(
+            (subtree.level, subtree.heading) for subtree in subtrees[1:]
+        )
+        contents[ID] = content
+    return contents
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+PhaseStats = namedtuple("PhaseStats", ["phase", "seconds", "rows", "peak_bytes"])
+
+MAX_LOAD_PHASES = 1024
+
+
+class _PhaseRecord:
+    """Mutable handle of a running phase, used to report its row count"""
+
+    __slots__ = ("rows", "_peak")
+
+    def __init__(self):
+        self.rows = None
+        self._peak = 0
+
+
+class LoadStats:
+    """
+    Recorder of the wall time, row count and peak allocation of load phases.
+
+    Every finished phase is appended to ``phases``, logged to the
+    ``orgroamtools`` logger at ``DEBUG`` level and passed to ``callback``.
+    Phases may be nested, the peak of an enclosing phase includes the peaks of
+    the phases it ran.
+
+    Attributes
+    ----------
+    phases : ``deque[PhaseStats]``
+        Last ``max_phases`` finished phases, in the order they ran
+    callback : ``Optional[Callable[[PhaseStats], None]]``
+        Called with the stats of every finished phase
+    trace_memory : ``bool``
+        Whether to measure peak allocations with ``tracemalloc``. Allocations are
+        also measured whenever ``tracemalloc`` is already tracing
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[PhaseStats], None]] = None,
+        trace_memory: bool = False,
+        max_phases: int = MAX_LOAD_PHASES,
+    ):
+        self.phases = deque(maxlen=max_phases)
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self._running = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[_PhaseRecord]:
+        """Time the enclosed block as phase ``name``
+
+        Parameters
+        ----------
+        name : ``str``
+            Name of the phase
+
+        Yields
+        ------
+        ``_PhaseRecord``
+            Handle whose ``rows`` attribute the block may set to the number of rows
+            or items it processed
+        """
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            baseline, peak = tracemalloc.get_traced_memory()
+            # Resetting the peak loses it for the running phases, so it is kept
+            # on their records first
+            for outer in self._running:
+                outer._peak = max(outer._peak, peak)
+            tracemalloc.reset_peak()
+
+        record = _PhaseRecord()
+        self._running.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            seconds = time.perf_counter() - start
+            self._running.remove(record)
+            if tracing:
+                peak = max(record._peak, tracemalloc.get_traced_memory()[1]) - baseline
+            else:
+                peak = None
+            if started_tracing:
+                tracemalloc.stop()
+
+            stats = PhaseStats(name, seconds, record.rows, peak)
+            self.phases.append(stats)
+            logger.debug(
+                "phase %s took %.6fs (rows=%s, peak_bytes=%s)",
+                name,
+                seconds,
+                record.rows,
+                peak,
+            )
+            if self.callback is not None:
+                self.callback(stats)
+
+
+class OrgFileCache:
+    """
+    Bounded LRU cache of parsed org files.
+
+    Entries are keyed by file path and validated against the file's mtime and
+    size, so an edited file is parsed again on its next lookup. Each entry maps
+    the ``:ID:`` property of every heading in the file to its subtree, so finding
+    the subtree of a node is a dict lookup.
+
+    Attributes
+    ----------
+    maxsize : ``int``
+        Maximum number of parsed files kept in the cache
+    hits : ``int``
+        Number of lookups served from the cache
+    misses : ``int``
+        Number of lookups that required parsing a file
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def subtrees(self, fname: str) -> dict[str, op.node.OrgBaseNode]:
+        """Return map of IDs to subtrees of an org file
+
+        Parameters
+        ----------
+        fname : ``str``
+            Path of org file
+
+        Returns
+        -------
+        ``dict[str, orgparse.node.OrgBaseNode]``
+            dict with keys the IDs found in the file and values the first
+            subtree carrying that ID
+        """
+        stat = os.stat(fname)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(fname)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(fname)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        index = subtree_index(fname)
+
+        with self._lock:
+            self._entries[fname] = (stamp, index)
+            self._entries.move_to_end(fname)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return index
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics of the cache
+
+        Returns
+        -------
+        ``CacheInfo``
+            Named tuple ``(hits, misses, maxsize, currsize)``
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self) -> None:
+        """Empty the cache and reset its statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+ORG_FILE_CACHE = OrgFileCache()
+
+
+@lru_cache(maxsize=None)
+def _heading_re(level: int) -> re.Pattern:
+    """Return pattern matching headings of level at most ``level``"""
+    return re.compile(rb"^\*{1,%d}[ \t]" % level, re.MULTILINE)
+
+
+def seek_body(
+    fname: str, node_id: str, pos: int, level: int, format: str = "plain"
+) -> Optional[str]:
+    """Return body of a heading node by slicing its region out of the file
+
+    The file is memory-mapped and the heading carrying ``node_id`` is searched
+    for from ``pos`` onwards. Its region runs up to the next heading of the same
+    or higher level, and only that region is handed to ``orgparse``.
+
+    Parameters
+    ----------
+    fname : ``str``
+        Path of org file containing the node
+    node_id : ``str``
+        ID of the node
+    pos : ``int``
+        Character position of the node's heading, as recorded by org-roam
+    level : ``int``
+        Heading level of the node
+    format : ``str``
+        Format of the body passed to ``orgparse``'s ``get_body``: ``"plain"``
+        renders links as their descriptions, ``"raw"`` keeps the org markup
+
+    Returns
+    -------
+    ``Optional[str]``
+        Body text of node, or ``None`` if the node is not found where ``pos`` and
+        ``level`` say it should be
+    """
+    needle = node_id.encode("utf-8")
+    try:
+        with open(fname, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            # A character position never exceeds the matching byte position
+            idx = mm.find(needle, max(pos - 1, 0))
+            while idx != -1:
+                line_start = mm.rfind(b"\n", 0, idx) + 1
+                line_end = mm.find(b"\n", idx)
+                line_end = len(mm) if line_end == -1 else line_end
+                if mm[line_start:line_end].split() == [b":ID:", needle]:
+                    break
+                idx = mm.find(needle, idx + 1)
+            else:
+                return None
+
+            start = mm.rfind(b"\n*", 0, line_start) + 1
+            stars = mm[start : start + level + 1]
+            if stars[:level] != b"*" * level or stars[level:] not in (b" ", b"\t"):
+                return None
+
+            heading_end = mm.find(b"\n", start)
+            match = _heading_re(level).search(mm, heading_end + 1)
+            end = match.start() if match else len(mm)
+            region = mm[start:end].decode("utf-8")
+    except (OSError, ValueError):
+        return None
+
+    for node in op.loads(region):
+        if node.get_property("ID") == node_id:
+            return "\n".join(subtree.get_body(format) for subtree in node)
+    return None
+
+
+class CSRAdjacency:
+    """
+    Compact adjacency structure of a directed multigraph.
+
+    Nodes are identified by a dense integer row, and the outgoing and incoming
+    edges of every node are stored in compressed sparse row (CSR) form: the
+    targets of row ``r`` are ``out_targets[out_offsets[r]:out_offsets[r + 1]]``,
+    and likewise for sources with ``in_offsets``/``in_targets``. Edges cost
+    4 bytes per direction instead of a Python object.
+
+    Attributes
+    ----------
+    IDs : ``list[str]``
+        Node ID of each row
+    row : ``dict[str, int]``
+        Map with keys node IDs and values their row
+    out_offsets : ``array``
+        Start of each row's outgoing edges in ``out_targets``, with a final entry
+        holding the number of edges
+    out_targets : ``array``
+        Target rows of outgoing edges, in the order the links were given
+    in_offsets : ``array``
+        Start of each row's incoming edges in ``in_targets``
+    in_targets : ``array``
+        Source rows of incoming edges, ascending for each row
+    self_loops : ``array``
+        Number of edges from each row to itself
+    """
+
+    def __init__(self, links: Iterable[Tuple[str, Iterable[str]]]):
+        """Build adjacency structure in one pass over the edges
+
+        Parameters
+        ----------
+        links : ``Iterable[Tuple[str, Iterable[str]]]``
+            Pairs of node ID and the IDs it links to. Links to IDs not among the
+            nodes are dropped
+        """
+        links = list(links)
+        self.IDs = [ID for ID, _ in links]
+        self.row = {ID: r for r, ID in enumerate(self.IDs)}
+        n = len(self.IDs)
+
+        self.out_offsets = array("q", [0])
+        self.out_targets = array("i")
+        self.self_loops = array("i", [0]) * n
+        in_counts = [0] * n
+        for r, (_, targets) in enumerate(links):
+            for other in targets:
+                t = self.row.get(other)
+                if t is None:
+                    continue
+                self.out_targets.append(t)
+                in_counts[t] += 1
+                if t == r:
+                    self.self_loops[r] += 1
+            self.out_offsets.append(len(self.out_targets))
+
+        self.in_offsets = array("q", accumulate(in_counts, initial=0))
+        self.in_targets = array("i", [0]) * len(self.out_targets)
+        fill = self.in_offsets[:-1]
+        for r in range(n):
+            for t in self.out_targets[self.out_offsets[r] : self.out_offsets[r + 1]]:
+                self.in_targets[fill[t]] = r
+                fill[t] += 1
+
+    def __len__(self) -> int:
+        return len(self.IDs)
+
+    @property
+    def num_edges(self) -> int:
+        """Return number of edges, counting self loops and parallel edges"""
+        return len(self.out_targets)
+
+    @property
+    def nbytes(self) -> int:
+        """Return number of bytes held by the CSR arrays"""
+        return sum(
+            arr.itemsize * len(arr)
+            for arr in (
+                self.out_offsets,
+                self.out_targets,
+                self.in_offsets,
+                self.in_targets,
+                self.self_loops,
+            )
+        )
+
+    def successors(self, r: int) -> array:
+        """Return target rows of the outgoing edges of row ``r``"""
+        return self.out_targets[self.out_offsets[r] : self.out_offsets[r + 1]]
+
+    def predecessors(self, r: int) -> array:
+        """Return source rows of the incoming edges of row ``r``"""
+        return self.in_targets[self.in_offsets[r] : self.in_offsets[r + 1]]
+
+    def out_degree(self, r: int) -> int:
+        """Return number of edges from row ``r`` to other rows"""
+        return self.out_offsets[r + 1] - self.out_offsets[r] - self.self_loops[r]
+
+    def in_degree(self, r: int) -> int:
+        """Return number of edges from other rows to row ``r``"""
+        return self.in_offsets[r + 1] - self.in_offsets[r] - self.self_loops[r]
+
+    def isolated(self) -> Iterator[int]:
+        """Yield rows with no edges to or from other rows"""
+        for r in range(len(self.IDs)):
+            if self.out_degree(r) == 0 and self.in_degree(r) == 0:
+                yield r
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        """Yield edges as pairs of node IDs, grouped by source row"""
+        IDs = self.IDs
+        for r, ID in enumerate(IDs):
+            for t in self.successors(r):
+                yield ID, IDs[t]
+
+
+def iter_rows(cursor: sqlite3.Cursor, batch_size: int) -> Iterator[tuple]:
+    """Yield rows of an executed query, fetched in batches
+
+    At most ``batch_size`` rows are held in Python at a time, so rows can be
+    folded into their final structures as they arrive.
+
+    Parameters
+    ----------
+    cursor : ``sqlite3.Cursor``
+        Cursor of an executed query
+    batch_size : ``int``
+        Number of rows fetched at a time
+
+    Yields
+    ------
+    ``tuple``
+        Rows of the query, in order
+    """
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def url_host(path: Optional[str]) -> Optional[str]:
+    """Return host of the target of a web link
+
+    org-roam stores the target of a link like ``https://arxiv.org/abs/1234``
+    without its type, e.g. ``//arxiv.org/abs/1234``. Both forms are accepted.
+
+    Parameters
+    ----------
+    path : ``Optional[str]``
+        Target of a link, as stored in the ``links`` table without quotes
+
+    Returns
+    -------
+    ``Optional[str]``
+        Lowercased host of the target, without user or port, ``None`` if it has
+        none
+    """
+    if not path:
+        return None
+    if "://" not in path:
+        path = "//" + path.lstrip("/")
+    try:
+        return urllib.parse.urlsplit(path).hostname
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class NodeSelection:
+    """
+    Subset of the nodes of an org-roam database, selected in SQL.
+
+    Conditions that are set are combined with AND; a selection with no
+    conditions selects every node.
+
+    Attributes
+    ----------
+    tags : ``Tuple[str, ...]``
+        Select nodes carrying at least one of these tags
+    file_glob : ``Optional[str]``
+        Select nodes in files whose path matches this glob pattern (as in
+        SQLite's ``GLOB``, e.g. ``"*/projects/*.org"``)
+    title_like : ``Optional[str]``
+        Select nodes whose title matches this pattern (as in SQLite's
+        case-insensitive ``LIKE``, e.g. ``"%category%"``)
+    max_level : ``Optional[int]``
+        Select nodes at most this deep, ``0`` meaning file level nodes only
+    """
+
+    tags: Tuple[str, ...] = ()
+    file_glob: Optional[str] = None
+    title_like: Optional[str] = None
+    max_level: Optional[int] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.tags) or any(
+            value is not None
+            for value in (self.file_glob, self.title_like, self.max_level)
+        )
+
+    def where(self) -> Tuple[str, list]:
+        """Return SQL condition on the ``nodes`` table matching the selection
+
+        Values in the org-roam database are stored quoted, so patterns are
+        quoted the same way before being bound.
+
+        Returns
+        -------
+        ``Tuple[str, list]``
+            Condition (``"1"`` for an empty selection) and its parameters
+        """
+        conditions, params = [], []
+        if self.tags:
+            conditions.append(
+                "id IN (SELECT node_id FROM tags "
+                "WHERE tag IN (SELECT value FROM json_each(?)))"
+            )
+            params.append(json.dumps([f'"{tag}"' for tag in self.tags]))
+        if self.file_glob is not None:
+            conditions.append("file GLOB ?")
+            params.append(f'"{self.file_glob}"')
+        if self.title_like is not None:
+            conditions.append("title LIKE ?")
+            params.append(f'"{self.title_like}"')
+        if self.max_level is not None:
+            conditions.append("level <= ?")
+            params.append(self.max_level)
+        return " AND ".join(conditions) or "1", params
+
+
+ACCESS_MODES = ("rw", "ro", "immutable", "memory")
+
+
+class ConnectionPool:
+    """
+    Single shared connection to an org-roam database.
+
+    The connection is opened on first use and then reused by every load and
+    update, with a lock serializing its use across threads. It is opened in
+    one of ``ACCESS_MODES``:
+
+    - ``"rw"``: plain read-write connection
+    - ``"ro"``: read-only connection (``mode=ro``), which never writes to
+      the database or creates it
+    - ``"immutable"``: read-only connection that also skips locking and
+      change detection (``mode=ro&immutable=1``). Only safe while nothing writes
+      to the database, so it is reopened by ``invalidate``
+    - ``"memory"``: in-memory copy of the database, taken when the connection
+      is opened and again after ``invalidate``
+
+    Attributes
+    ----------
+    db_path : ``Optional[str]``
+        Path of the database file, ``None`` for a provided in-memory connection
+    access : ``Optional[str]``
+        Access mode, ``None`` for a provided connection
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        access: str = "ro",
+        connection: Optional[sqlite3.Connection] = None,
+    ):
+        if connection is None and access not in ACCESS_MODES:
+            raise ValueError(f"access must be one of {ACCESS_MODES}: {access}")
+        self.db_path = db_path
+        self.access = None if connection is not None else access
+        self._connection = connection
+        self._lock = threading.RLock()
+
+    @classmethod
+    def of_connection(cls, connection: sqlite3.Connection) -> "ConnectionPool":
+        """Return pool serving an existing connection
+
+        The connection is never closed or reopened by the pool.
+
+        Parameters
+        ----------
+        connection : ``sqlite3.Connection``
+            Connection to an org-roam database, possibly in-memory
+
+        Returns
+        -------
+        ``ConnectionPool``
+            Pool with ``db_path`` the file behind ``connection``, if any
+        """
+        db_path = None
+        for _, name, fname in connection.execute("PRAGMA database_list"):
+            if name == "main" and fname:
+                db_path = fname
+        return cls(db_path, connection=connection)
+
+    def __open(self) -> sqlite3.Connection:
+        """Open a new connection in the pool's access mode"""
+        path = urllib.parse.quote(os.path.abspath(self.db_path))
+        query = {"rw": "", "ro": "?mode=ro", "immutable": "?mode=ro&immutable=1"}
+        if self.access != "memory":
+            return sqlite3.connect(
+                f"file:{path}{query[self.access]}", uri=True, check_same_thread=False
+            )
+
+        source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            copy = sqlite3.connect(":memory:", check_same_thread=False)
+            source.backup(copy)
+        finally:
+            source.close()
+        return copy
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Hold the shared connection, opening it if needed
+
+        Yields
+        ------
+        ``sqlite3.Connection``
+            Connection to the database, not to be used after the block exits
+        """
+        with self._lock:
+            if self._connection is None:
+                self._connection = self.__open()
+            yield self._connection
+
+    def invalidate(self) -> None:
+        """Drop a connection that cannot see later changes to the database
+
+        Immutable connections and in-memory copies are closed, to be reopened on
+        next use. Other connections are kept.
+        """
+        with self._lock:
+            if self.access in ("immutable", "memory") and self._connection:
+                self._connection.close()
+                self._connection = None
+
+    def close(self) -> None:
+        """Close the connection, unless it was provided to the pool"""
+        with self._lock:
+            if self.access is not None and self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+SearchHit = namedtuple("SearchHit", ["id", "title", "snippet", "score"])
+
+
+class SearchIndex:
+    """
+    Full-text index of node bodies kept in a sidecar SQLite FTS5 database.
+
+    Every indexed node is recorded together with the file it lives in and the
+    hash ``org-roam`` reported for that file when the node was indexed. Syncing
+    only reads the org files whose hash changed, so an up to date index is
+    searched without touching any org file.
+
+    Attributes
+    ----------
+    path : ``str``
+        Path of the sidecar database
+    """
+
+    SCHEMA_VERSION = 1
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS indexed (
+        rowid INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, file TEXT, hash TEXT
+    );
+    CREATE INDEX IF NOT EXISTS indexed_file ON indexed (file);
+    CREATE VIRTUAL TABLE IF NOT EXISTS bodies USING fts5 (
+        title, body, tokenize = 'porter unicode61'
+    );
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._con = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        (version,) = self._con.execute("PRAGMA user_version").fetchone()
+        if version != self.SCHEMA_VERSION:
+            self._con.executescript(
+                "DROP TABLE IF EXISTS indexed; DROP TABLE IF EXISTS bodies;"
+            )
+        self._con.executescript(self.SCHEMA)
+        self._con.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._con.execute("SELECT COUNT(*) FROM indexed").fetchone()[0]
+
+    def sync(
+        self,
+        nodes: Iterable[Tuple[str, str, str]],
+        file_hashes: dict[str, str],
+    ) -> int:
+        """Bring the index up to date with a collection
+
+        Rows indexed from a file whose hash is no longer ``file_hashes[file]``
+        are dropped, and nodes not indexed at their file's current hash are
+        read from disk and indexed. Rows of other nodes are kept, so collections
+        derived from the same database can share one index.
+
+        Parameters
+        ----------
+        nodes : ``Iterable[Tuple[str, str, str]]``
+            Triples ``(ID, TITLE, FNAME)`` of the nodes to index
+        file_hashes : ``dict[str, str]``
+            Map with keys filenames and values their current content hash
+
+        Returns
+        -------
+        ``int``
+            Number of nodes (re)indexed
+        """
+        with self._lock, self._con as con:
+            indexed = {
+                ID: (rowid, fname, fhash)
+                for rowid, ID, fname, fhash in con.execute(
+                    "SELECT rowid, id, file, hash FROM indexed"
+                )
+            }
+            stale = [
+                rowid
+                for rowid, fname, fhash in indexed.values()
+                if file_hashes.get(fname) != fhash
+            ]
+            pending = {}
+            for ID, title, fname in nodes:
+                entry = indexed.get(ID)
+                fhash = file_hashes.get(fname)
+                if entry is None or entry[1:] != (fname, fhash):
+                    if entry is not None:
+                        stale.append(entry[0])
+                    pending.setdefault(fname, []).append((ID, title))
+
+            stale = list(set(stale))
+            con.execute(
+                "DELETE FROM bodies WHERE rowid IN (SELECT value FROM json_each(?))",
+                (json.dumps(stale),),
+            )
+            con.execute(
+                "DELETE FROM indexed WHERE rowid IN (SELECT value FROM json_each(?))",
+                (json.dumps(stale),),
+            )
+
+            for fname, entries in pending.items():
+                try:
+                    bodies = file_bodies(fname, [ID for ID, _ in entries])
+                except OSError:
+                    bodies = {}
+                for ID, title in entries:
+                    rowid = con.execute(
+                        "INSERT INTO indexed (id, file, hash) VALUES (?, ?, ?)",
+                        (ID, fname, file_hashes.get(fname)),
+                    ).lastrowid
+                    con.execute(
+                        "INSERT INTO bodies (rowid, title, body) VALUES (?, ?, ?)",
+                        (rowid, title, bodies.get(ID, "")),
+                    )
+        return sum(len(entries) for entries in pending.values())
+
+    def search(
+        self, query: str, limit: int = 10, IDs: Optional[Iterable[str]] = None
+    ) -> list[SearchHit]:
+        """Return best matches of an FTS5 query
+
+        Parameters
+        ----------
+        query : ``str``
+            Query in SQLite FTS5 syntax, matched against titles and bodies
+        limit : ``int``
+            Maximum number of hits
+        IDs : ``Optional[Iterable[str]]``
+            If given, only nodes with these IDs are returned
+
+        Returns
+        -------
+        ``list[SearchHit]``
+            Hits ordered best first, with ``score`` the (negative) bm25 rank
+        """
+        sql_query = """
+        SELECT indexed.id, bodies.title,
+               snippet(bodies, 1, '[', ']', '...', 12), bm25(bodies)
+        FROM bodies JOIN indexed ON indexed.rowid = bodies.rowid
+        WHERE bodies MATCH ?
+        """
+        params = [query]
+        if IDs is not None:
+            sql_query += " AND indexed.id IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(list(IDs)))
+        sql_query += " ORDER BY bm25(bodies) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [SearchHit(*row) for row in self._con.execute(sql_query, params)]
+
+    def close(self) -> None:
+        """Close the connection to the sidecar database"""
+        with self._lock:
+            self._con.close()
@@ -1,30 +1,85 @@
 from __future__ import annotations
+import asyncio
 import os
 import warnings
 import sqlite3 as sql
-import copy
-from typing import Iterable, Tuple, Optional
-from dataclasses import dataclass
-
-import networkx as nx
-
-import orgparse as op
+import hashlib
+import json
+import pickle
+import sys
+import tempfile
+import threading
+import weakref
+from collections import Counter, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import (
+    AsyncIterator,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    Mapping,
+    Tuple,
+    Optional,
+    TYPE_CHECKING,
+    Union,
+)
+from dataclasses import dataclass, field, replace
 
 from orgroamtools._utils import (
     IdentifierType,
     DuplicateTitlesWarning,
-    extract_math_snippets,
-    extract_src_blocks,
+    scan_body,
+    BodyContent,
+    ORG_FILE_CACHE,
+    seek_body,
+    file_bodies,
+    file_contents,
+    CSRAdjacency,
+    import_optional,
+    lazy_import,
+    deep_sizeof,
+    SearchIndex,
+    SearchHit,
+    LoadStats,
+    PhaseStats,
+    ConnectionPool,
+    ACCESS_MODES,
+    NodeSelection,
+    iter_rows,
+    url_host,
 )
 
+if TYPE_CHECKING:
+    import networkx as nx
+else:
+    # Bound lazily, so annotations resolve without importing networkx on load
+    nx = lazy_import("networkx")
+
+# Bump whenever the layout of snapshots written by RoamGraph changes
+SNAPSHOT_VERSION = 4
+
+GRAPH_TYPES = ("multi", "weighted", None)
+
+# Link types whose targets are web addresses, as used by link_domains
+WEB_LINK_TYPES = ("http", "https")
+
+# Default number of rows fetched from the database at a time
+FETCH_BATCH_SIZE = 4096
+
+# Default number of executor jobs the async APIs of one collection keep in flight
+ASYNC_CONCURRENCY = 8
 
-@dataclass
+
+@dataclass(slots=True)
 class RoamNode:
     """Store relevant org-roam node information
 
     A node is an atomic note known to the org-roam database.
     It is uniquely determined by an ID generated at the time of creation, but
     has other identifiers and information that a user might want to know about.
+    Nodes are slotted, so they carry no per-instance ``__dict__``.
 
     Attributes
     ----------
@@ -37,9 +92,18 @@ class RoamNode:
     tags : ``set[str]``
         Collection of tags of org-roam node
     backlinks : ``list[str]``
-        List of backlinks in org-roam node
-    misc_links : ``list[OrgLink]``
-        List of miscellaneous links that are not links to other nodes
+        List of backlinks in org-roam node. Once the node belongs to a
+        ``RoamGraph``, the links are held only by its adjacency structure and a
+        new list is built on every access, so assign a list to change them
+    misc_links : ``Optional[list[OrgLink]]``
+        List of miscellaneous links that are not links to other nodes. Nodes of a
+        loaded collection are created with ``None`` here, and the links are read
+        from the database on first access. Not part of ``repr`` or equality, so
+        neither reads the database
+    level : ``int``
+        Heading level of org-roam node, 0 if the node is a whole file
+    pos : ``Optional[int]``
+        Character position of the node in its file, as recorded by org-roam
     """
 
     id: str
@@ -47,25 +111,260 @@ class RoamNode:
     fname: str
     tags: set[str]
     backlinks: list[str]
-    misc_links: list[OrgLink]
+    misc_links: Optional[list[OrgLink]] = field(repr=False, compare=False)
+    level: int = 0
+    pos: Optional[int] = None
+    _misc_loader: Optional[_MiscLinkLoader] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def body(self) -> str:
+        """Return body of node, with links rendered as their descriptions
+
+        Returns
+        -------
+        ``str``
+            Body text of node
+        """
+        return self.get_body()
+
+    def get_body(self, format: str = "plain") -> str:
         """Return body of node
 
+        Heading nodes are read by slicing their region out of the file, located
+        through the ``pos`` and ``level`` recorded by org-roam. When those are
+        stale, the whole file is parsed instead. Parsed files are shared through
+        ``ORG_FILE_CACHE``, so nodes living in the same file only cause it to be
+        parsed once.
+
+        Parameters
+        ----------
+        format : ``str``
+            ``"plain"`` renders links as their descriptions, ``"raw"`` keeps the
+            org markup
+
         Returns
         -------
         ``str``
             Body text of node
         """
-        root = op.load(self.fname)
-        node_heading = [] 
-        for node in root:
-            if node.get_property("ID") == self.id:
-                node_heading = node
-                break
+        if self.level > 0 and self.pos is not None:
+            body = seek_body(self.fname, self.id, self.pos, self.level, format)
+            if body is not None:
+                return body
+
+        node_heading = ORG_FILE_CACHE.subtrees(self.fname).get(self.id, [])
+
+        return "\n".join(subtree.get_body(format) for subtree in node_heading)
+
+
+class _LazyMiscLinks:
+    """Descriptor of ``RoamNode.misc_links`` loading the links on first access
+
+    Wraps the slot of the field, so stored values live in the node as before.
+    """
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, node, owner=None):
+        if node is None:
+            return self
+        links = self.slot.__get__(node, owner)
+        if links is None and node._misc_loader is not None:
+            node._misc_loader.load()
+            links = self.slot.__get__(node, owner)
+        return links
+
+    def __set__(self, node, value):
+        self.slot.__set__(node, value)
+
+    def loaded(self, node: RoamNode) -> Optional[list[OrgLink]]:
+        """Return links stored in ``node`` without loading them"""
+        return self.slot.__get__(node, type(node))
+
+
+RoamNode.misc_links = _LazyMiscLinks(RoamNode.misc_links)
+
+
+class _AdjacencyRow:
+    """Backlinks of a node, held as a row of a ``CSRAdjacency``"""
+
+    __slots__ = ("adjacency", "row")
+
+    def __init__(self, adjacency: CSRAdjacency, row: int):
+        self.adjacency = adjacency
+        self.row = row
+
+    def links(self) -> list[str]:
+        """Return IDs of the row's outgoing edges, in the order they were made"""
+        IDs = self.adjacency.IDs
+        return [IDs[t] for t in self.adjacency.successors(self.row)]
+
+
+class _CompactBacklinks:
+    """Descriptor of ``RoamNode.backlinks`` reading them from the adjacency
+
+    ``RoamGraph`` replaces the lists of its nodes by ``_AdjacencyRow`` once the
+    CSR arrays are built, so each link is stored once, as two array entries.
+    Reading the attribute turns the row back into a list stored in the node, so
+    in-place edits of it stick, like assigned lists, until the next rebuild.
+    ``RoamGraph`` itself reads rows through ``links``, which stores nothing.
+    """
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, node, owner=None):
+        if node is None:
+            return self
+        backlinks = self.slot.__get__(node, owner)
+        if isinstance(backlinks, _AdjacencyRow):
+            backlinks = backlinks.links()
+            self.slot.__set__(node, backlinks)
+        return backlinks
+
+    def __set__(self, node, value):
+        self.slot.__set__(node, value)
+
+    def stored(self, node: RoamNode) -> Union[list[str], _AdjacencyRow]:
+        """Return backlinks stored in ``node`` without building a list"""
+        return self.slot.__get__(node, type(node))
+
+    def links(self, node: RoamNode) -> list[str]:
+        """Return backlinks of ``node`` without storing a list in it"""
+        backlinks = self.slot.__get__(node, type(node))
+        if isinstance(backlinks, _AdjacencyRow):
+            return backlinks.links()
+        return backlinks
+
+
+RoamNode.backlinks = _CompactBacklinks(RoamNode.backlinks)
+
+
+class _MiscLinkLoader:
+    """Load miscellaneous links of nodes from the database on first access
+
+    Nodes are registered with their ``misc_links`` left as ``None``. The first
+    access of any of them loads the links of every registered node in one query:
+    org-roam does not index the sources of the ``links`` table, so reading the
+    links of one node costs a scan of the table just like reading all of them.
+
+    Links are read from the database as it is when they are loaded. Files whose
+    hash differs from ``file_hashes``, the hashes the nodes were loaded with,
+    are reported with a warning; ``RoamGraph.update`` replaces their nodes with
+    newly registered ones.
+    """
+
+    __slots__ = ("pool", "batch_size", "stats", "pending", "file_hashes", "lock")
+
+    def __init__(self, pool: ConnectionPool, batch_size: int, stats: LoadStats):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.stats = stats
+        self.pending = dict()
+        self.file_hashes = dict()
+        # Held from taking the pending nodes until their links are assigned, so
+        # concurrent readers never see a node whose links are being loaded
+        self.lock = threading.RLock()
+
+    def __reduce__(self):
+        # Pickled nodes carry their links, never the connection to load them
+        return (type(None), ())
+
+    def register(self, node: RoamNode) -> None:
+        """Defer loading the links of ``node`` to their first access"""
+        with self.lock:
+            node.misc_links = None
+            node._misc_loader = self
+            self.pending.setdefault(node.id, []).append(node)
+
+    def discard(self, IDs: Iterable[str]) -> None:
+        """Stop loading the links of the registered nodes with these IDs"""
+        with self.lock:
+            for ID in IDs:
+                self.pending.pop(ID, None)
+
+    def load(self) -> None:
+        """Load the links of every registered node
+
+        Raises
+        ------
+        ``sqlite3.Error``
+            If the links could not be read. The nodes stay registered, so their
+            links are read again on their next access
+        """
+        # The connection is taken before the loader lock, the order in which
+        # RoamGraph.update takes them to register the nodes it reloads
+        with self.pool.connection() as con, self.lock:
+            self.__load(con)
+
+    def __load(self, con: sql.Connection) -> None:
+        """Load the links of every registered node on ``con``"""
+        pending, self.pending = self.pending, dict()
+        if not pending:
+            return
+        links = {ID: [] for ID in pending}
+        fnames = {node.fname for nodes in pending.values() for node in nodes}
+        links_query = """SELECT source, dest, type FROM links
+                WHERE type != '"id"' AND source IN (SELECT value FROM json_each(?))
+                ORDER BY type, dest;"""
+        hashes_query = """SELECT file, hash FROM files
+                WHERE file IN (SELECT value FROM json_each(?));"""
+        clean = lambda s: s.replace('"', "")
+        try:
+            with self.stats.phase("misc_links") as phase:
+                phase.rows = 0
+                params = (json.dumps([f'"{ID}"' for ID in pending]),)
+                cursor = con.execute(links_query, params)
+                for source, dest, link_type in iter_rows(cursor, self.batch_size):
+                    phase.rows += 1
+                    link_type = sys.intern(clean(link_type))
+                    link = OrgLink(link_type, clean(dest), None)
+                    links[clean(source)].append(link)
+                params = (json.dumps([f'"{fname}"' for fname in fnames]),)
+                hashes = {
+                    clean(fname): clean(fhash)
+                    for fname, fhash in con.execute(hashes_query, params)
+                }
+        except sql.Error:
+            self.pending = pending
+            raise
+
+        changed = [
+            fname
+            for fname in fnames
+            if hashes.get(fname) != self.file_hashes.get(fname)
+        ]
+        if changed:
+            warnings.warn(
+                f"{len(changed)} files changed since the collection was loaded, "
+                "their links are read from the current database. Call update() "
+                "to reload their nodes"
+            )
 
-        return "\n".join(subtree.get_body() for subtree in node_heading)
+        for ID, nodes in pending.items():
+            for node in nodes:
+                node.misc_links = list(links[ID])
+
+
+def _replace_node(node: RoamNode, **changes) -> RoamNode:
+    """Return copy of ``node`` with ``changes`` applied, as ``dataclasses.replace``
+
+    Unlike ``dataclasses.replace``, this does not load the miscellaneous links of
+    ``node``: when they were not loaded yet, the copy has ``misc_links`` set to
+    ``None`` and is not registered with any loader.
+    """
+    misc_links = RoamNode.misc_links.loaded(node)
+    if misc_links is not None:
+        misc_links = list(misc_links)
+    changes.setdefault("misc_links", misc_links)
+    return replace(node, **changes)
 
 
 class RoamGraph:
@@ -83,13 +382,17 @@ class RoamGraph:
 
     Attributes
     ----------
-    db_path : ``str``
-        Path to org-roam database connected to graph
+    db_path : ``Optional[str]``
+        Path to org-roam database connected to graph, ``None`` if loaded from an
+        in-memory connection
 
     _id_title_map : ``dict[str,str]``
         Map with keys the id of nodes and values the titles of the corresponding nodes
-    _graph : ``nx.MultiDiGraph``
-        ``networkx`` graph representation of the collection
+    _graph : ``Optional[nx.Graph]``
+        ``networkx`` graph representation of the collection, built on first access
+        of ``graph``
+    _graph_type : ``Optional[str]``
+        Kind of ``networkx`` graph ``graph`` builds, one of ``GRAPH_TYPES``
     _node_index : ``dict[str, RoamNode]``
         Map with keys the ID of nodes and values the ``RoamNode`` object that corresponds
     _orphans : ``list[RoamNode]``
@@ -97,6 +400,36 @@ class RoamGraph:
         other node
     _is_connected : ``bool``
         Tracks if network is connected (i.e. has no orphans)
+    _adjacency : ``CSRAdjacency``
+        Compact integer-indexed adjacency structure of the collection, serving
+        sizes, neighbors, degrees and orphans
+    _title_index : ``dict[str, list[str]]``
+        Map with keys the titles of nodes and values the IDs of the nodes with that
+        title, ordered ascending
+    _tag_node_index : ``dict[str, set[str]]``
+        Map with keys the tags of the collection and values the IDs of the nodes
+        with that tag
+    _content_index : ``Optional[dict[str, BodyContent]]``
+        Scanned content of node bodies, built on first access of ``content_index``
+    _search_index : ``Optional[SearchIndex]``
+        Full-text index of node bodies, opened and synced on first ``search``
+    _selection : ``NodeSelection``
+        Selectors nodes were loaded with, applied again by ``update``
+    _derived : ``bool``
+        Whether the collection was derived from another one (``filter_tags``,
+        ``materialize``), which ``update`` cannot bring up to date
+    _orphans_removed : ``bool``
+        Whether ``remove_orphans`` was called, so ``update`` drops orphans again
+    _removed_orphans : ``dict[str, RoamNode]``
+        Nodes dropped by ``remove_orphans``, considered again by ``update`` in case
+        a changed file links to them
+    _pool : ``Optional[ConnectionPool]``
+        Shared connection to the database, used by loads and ``update``
+    _misc_loader : ``Optional[_MiscLinkLoader]``
+        Loader of the miscellaneous links of nodes, run on first access of any of
+        them and shared with derived collections
+    _load_stats : ``LoadStats``
+        Timings of the load phases of the collection, see ``load_stats``
     _duplicate_titles : ``list[str]``
         List of duplicated titles in network, used for warning user
     _contains_dup_titles : ``bool``
@@ -104,298 +437,601 @@ class RoamGraph:
     """
 
     @classmethod
-    def init_empty(self):
-        """Initialize empty RoamNode object
+    def init_empty(cls):
+        """Initialize empty RoamGraph object
 
         Returns
         -------
-        RoamNode object with default fields initialized
+        RoamGraph object with default fields initialized
         """
+        self = cls.__new__(cls)
         self.db_path = None
+        self._pool = None
 
         self._duplicate_titles = []
         self._contains_dup_titles = None
 
         self._id_title_map = dict()
+        self._title_index = dict()
+        self._tag_node_index = dict()
         self._graph = None
+        self._graph_type = "multi"
+        self._cache_dir = None
+        self._search_index = None
+        self._content_index = None
+        self._load_stats = LoadStats()
+        self._async_semaphores = weakref.WeakKeyDictionary()
+        self._batch_size = FETCH_BATCH_SIZE
+        self._selection = NodeSelection()
+        self._derived = False
+        self._orphans_removed = False
+        self._removed_orphans = dict()
         self._node_index = dict()
 
-        self._misc_link_index = dict()
+        self._misc_loader = None
+        self._file_hashes = dict()
         self._orphans = []
         self._is_connected = None
+        self._adjacency = CSRAdjacency([])
         return self
 
-    def __init__(self, db: str):
+    def __init__(
+        self,
+        db: Union[str, sql.Connection],
+        cache_dir: Optional[str] = None,
+        graph_type: Optional[str] = "multi",
+        on_phase: Optional[Callable[[PhaseStats], None]] = None,
+        trace_memory: bool = False,
+        access: str = "ro",
+        batch_size: int = FETCH_BATCH_SIZE,
+        tags: Optional[Iterable[str]] = None,
+        file_glob: Optional[str] = None,
+        title_like: Optional[str] = None,
+        max_level: Optional[int] = None,
+    ):
         """Initializes RoamGraph object
 
         The RoamGraph object stores information about the nodes in the
         collection described by the database path provided. The nodes also store
         information about how they relate to each other via backlinks.
 
+        The ``tags``, ``file_glob``, ``title_like`` and ``max_level`` selectors
+        load part of the collection. They are combined with AND and evaluated by
+        SQLite, so rows of other nodes are never read, and links to nodes outside
+        the selection are dropped as with ``filter_tags``.
+
         Parameters
         ----------
-        db : ``str``
-            Path to org-roam database
+        db : ``Union[str, sqlite3.Connection]``
+            Path to org-roam database, or an open connection to one (e.g. an
+            in-memory copy shared between several loads)
+        cache_dir : ``Optional[str]``
+            Directory to keep a snapshot of the loaded collection in. When the
+            database has not changed since the snapshot was taken, the collection is
+            loaded from the snapshot instead of the database. The full-text index
+            used by ``search`` is kept there too
+        graph_type : ``Optional[str]``
+            Kind of ``networkx`` graph built on first access of ``graph``:
+            ``"multi"`` for a ``nx.MultiDiGraph`` with one edge per link,
+            ``"weighted"`` for a ``nx.DiGraph`` whose edges carry the number of
+            links as ``weight``, or ``None`` to never build one. Everything but
+            ``graph`` works without ``networkx`` installed
+        on_phase : ``Optional[Callable[[PhaseStats], None]]``
+            Called with the stats of every load phase as soon as it finishes, e.g.
+            to export them as metrics. Phases are also logged to the
+            ``orgroamtools`` logger at ``DEBUG`` level
+        trace_memory : ``bool``
+            Whether to record the peak allocations of each phase with
+            ``tracemalloc``, which slows loading down
+        access : ``str``
+            How to open the database when ``db`` is a path, one of
+            ``ACCESS_MODES``: ``"ro"`` read-only, ``"immutable"`` read-only
+            without locking (only while nothing writes to it), ``"memory"`` to
+            load from an in-memory copy, or ``"rw"``. Ignored for connections
+        batch_size : ``int``
+            Number of rows fetched from the database at a time while loading
+        tags : ``Optional[Iterable[str]]``
+            Only load nodes carrying at least one of these tags
+        file_glob : ``Optional[str]``
+            Only load nodes in files whose path matches this glob pattern, e.g.
+            ``"*/projects/*"``
+        title_like : ``Optional[str]``
+            Only load nodes whose title matches this SQL ``LIKE`` pattern, e.g.
+            ``"%category%"``
+        max_level : ``Optional[int]``
+            Only load nodes at most this deep, ``0`` meaning file level nodes only
+
+        Raises
+        ------
+        ``AttributeError``
+            Raised if the database does not exist
+        ``ValueError``
+            Raised if ``graph_type`` is not one of ``GRAPH_TYPES`` or ``access`` is
+            not one of ``ACCESS_MODES``
 
         Examples
         --------
         >>> collection = RoamGraph(PATH_TO_ORGROAM_DB)
+        >>> cached = RoamGraph(PATH_TO_ORGROAM_DB, cache_dir="~/.cache/orgroamtools")
+        >>> profiled = RoamGraph(PATH_TO_ORGROAM_DB, on_phase=print, trace_memory=True)
+        >>> frozen = RoamGraph(PATH_TO_ORGROAM_DB, access="immutable")
+        >>> math = RoamGraph(PATH_TO_ORGROAM_DB, tags={"math"}, max_level=0)
         """
 
         super(RoamGraph, self).__init__()
 
-        self.db_path = os.path.expanduser(db)
-        if not os.path.isfile(self.db_path):
-            raise AttributeError(f"No such file or directory: {self.db_path}")
-
-        _fnames = self.__init_fnames(self.db_path)
-
-        _titles = self.__init_titles(self.db_path)
-        _ids = self.__init_ids(self.db_path)
-        links = self.__init_links_to(db)
-        _links_to = [[ID for ID in link_list if ID in _ids] for link_list in links]
-        _tags = self.__init_tags(self.db_path)
-        _misc_links = self.__init_misc_links(self.db_path)
+        if isinstance(db, sql.Connection):
+            self._pool = ConnectionPool.of_connection(db)
+            self.db_path = self._pool.db_path
+        else:
+            self.db_path = os.path.expanduser(db)
+            if not os.path.isfile(self.db_path):
+                raise AttributeError(f"No such file or directory: {self.db_path}")
+            self._pool = ConnectionPool(self.db_path, access)
+        if graph_type not in GRAPH_TYPES:
+            raise ValueError(f"graph_type must be one of {GRAPH_TYPES}: {graph_type}")
+        self._graph_type = graph_type
+        self._graph = None
+        self._cache_dir = None if cache_dir is None else os.path.expanduser(cache_dir)
+        self._search_index = None
+        self._content_index = None
+        self._load_stats = LoadStats(on_phase, trace_memory)
+        self._async_semaphores = weakref.WeakKeyDictionary()
+        self._batch_size = batch_size
+        self._misc_loader = _MiscLinkLoader(self._pool, batch_size, self._load_stats)
+        self._derived = False
+        self._orphans_removed = False
+        self._removed_orphans = dict()
+        self._selection = NodeSelection(
+            tuple(sorted(set(tags or ()))),
+            None if file_glob is None else os.path.expanduser(file_glob),
+            title_like,
+            max_level,
+        )
 
-        self._node_index = {
-            j[0]: RoamNode(j[0], j[1], j[2], j[3], j[4], j[5])
-            for j in zip(_ids, _titles, _fnames, _tags, _links_to, _misc_links)
-        }
-        seen = set()
-        self._duplicate_titles = [x for x in self.titles if x in seen or seen.add(x)]
-        self._contains_dup_titles = len(self._duplicate_titles) > 0
-        if self._contains_dup_titles:
-            warnings.warn(
-                "Collection contains duplicate titles. Matching nodes by title will be non-exhaustive.",
-                DuplicateTitlesWarning,
-            )
+        snapshot = None
+        if self._cache_dir is not None and self.db_path is not None:
+            snapshot = self.__snapshot_path(self._cache_dir)
+
+        if snapshot is None or not self.__load_snapshot(snapshot):
+            self._file_hashes = dict()
+            self._node_index = dict()
+            try:
+                with self._pool.connection() as con:
+                    self._file_hashes = self.__load_file_hashes(con)
+                    self._misc_loader.file_hashes = self._file_hashes
+                    self._node_index = self.__load_nodes(con)
+
+            except sql.Error as e:
+                print("Connection failed: ", e)
+                # A failed load is not cached, the next one reads the database
+                snapshot = None
+            self.__build_adjacency()
+            if snapshot is not None:
+                self.__save_snapshot(snapshot)
+
+        self.__build_title_index()
+        self.__build_tag_index()
+
+    def close(self) -> None:
+        """Close the connections held by the collection
+
+        The database connection is only closed if the collection opened it, and
+        is shared with collections derived from this one. It is reopened if the
+        collection is used again.
+        """
+        if self._pool is not None:
+            self._pool.close()
+        self.__drop_search_index()
 
-        # In rare cases we'll pick up links to nonexistent nodes
-        self._misc_link_index = {_ids[i]: _misc_links[i] for i in range(len(_ids))}
+    @classmethod
+    async def aload(
+        cls, db: str, executor: Optional[Executor] = None, **kwargs
+    ) -> RoamGraph:
+        """Load a collection without blocking the event loop
 
-        self._id_title_map = {_ids[i]: self.titles[i] for i in range(len(_ids))}
+        The database is read and indexed on ``executor``, so the event loop keeps
+        serving other tasks meanwhile.
 
-        self._graph = nx.MultiDiGraph({_ids[i]: _links_to[i] for i in range(len(_ids))})
+        Parameters
+        ----------
+        db : ``str``
+            Path to org-roam database
+        executor : ``Optional[Executor]``
+            Executor to load on, the event loop's default executor if ``None``
+        **kwargs
+            Further arguments of ``RoamGraph``
 
-        self._orphans = [
-            node
-            for node in self._node_index.values()
-            if not any(
-                [
-                    self._nodes_linked(node, other, directed=False)
-                    for other in self._node_index.values()
-                    if other != node
-                ]
-            )
-        ]
-        self._is_connected = self._orphans == []
+        Returns
+        -------
+        ``RoamGraph``
+            Loaded collection
 
-    def __filter_tags(self, tags: list[str], exclude: bool) -> list[RoamNode]:
-        """Filter network by tags
+        Examples
+        --------
+        >>> collection = await RoamGraph.aload(PATH_TO_ORGROAM_DB, cache_dir=CACHE)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(cls, db, **kwargs))
 
+    def __snapshot_key(self) -> Tuple:
+        """Return key identifying the state of the database a snapshot was taken of
 
-        Parameters
-        ----------
-        tags : ``list[str]``
-            List of tags to filter by
-        exclude : ``bool``
-            Whether to exclude the tags in the new network or not
+        Returns
+        -------
+        ``Tuple``
+            Tuple (SNAPSHOT_VERSION, DB_PATH, MTIME, SIZE, SELECTION)
         """
-        tfilter = [self._node_has_tag(node, tag) for node in self.nodes for tag in tags]
-        if exclude:
-            tfilter = [not b for b in tfilter]
-        return [node for (node, b) in zip(self.nodes, tfilter) if b]
+        stat = os.stat(self.db_path)
+        return (
+            SNAPSHOT_VERSION,
+            os.path.abspath(self.db_path),
+            stat.st_mtime_ns,
+            stat.st_size,
+            self._selection,
+        )
 
-    def __init_ids(self, dbpath: str) -> list[str]:
-        """Initialize list of IDs for each node
+    def __snapshot_path(self, cache_dir: str) -> str:
+        """Return path of the snapshot of this collection's database
 
         Parameters
         ----------
-        dbpath : ``str``
-            Path of org-roam database
+        cache_dir : ``str``
+            Directory holding snapshots
 
         Returns
         -------
-        List of node IDs
+        ``str``
+            Path of snapshot file
         """
-        id_query = "SELECT id FROM nodes ORDER BY id ASC;"
-        try:
-            with sql.connect(dbpath, uri=True) as con:
-                csr = con.cursor()
-                query = csr.execute(id_query)
-                return [i[0].replace('"', "") for i in query.fetchall()]
-
-        except sql.Error as e:
-            print("Connection failed: ", e)
-        return []
+        # Every selection of the same database gets its own snapshot
+        source = f"{os.path.abspath(self.db_path)}\0{self._selection!r}"
+        digest = hashlib.sha1(source.encode()).hexdigest()
+        return os.path.join(cache_dir, f"{digest}.snapshot")
 
-    def __init_fnames(self, dbpath: str) -> list[str]:
-        """
-        Initializes list of filenames for each node
+    def __load_snapshot(self, path: str) -> bool:
+        """Load node index and adjacency structure from a snapshot
 
         Parameters
         ----------
-        dbpath : ``str``
-            Path to org-roam database
+        path : ``str``
+            Path of snapshot file
 
         Returns
         -------
-        List of node filepaths
+        ``bool``
+            True if the snapshot matched the database and was loaded. A missing,
+            stale or corrupt snapshot leaves the collection untouched
         """
-        fname_query = "SELECT file FROM nodes ORDER BY id ASC;"
-        try:
-            with sql.connect(dbpath, uri=True) as con:
-                csr = con.cursor()
-                query = csr.execute(fname_query)
-                return [i[0].replace('"', "") for i in query.fetchall()]
+        with self._load_stats.phase("snapshot_load") as phase:
+            try:
+                with open(path, "rb") as f:
+                    key, file_hashes, nodes, adjacency = pickle.load(f)
+                if key != self.__snapshot_key() or len(nodes) != len(adjacency):
+                    return False
+
+                node_index = dict()
+                for node in nodes:
+                    ID, title, fname, tags, misc_links, level, pos = node
+                    node_index[ID] = RoamNode(
+                        ID,
+                        title,
+                        fname,
+                        set(tags),
+                        None,
+                        [OrgLink(*link) for link in misc_links],
+                        level,
+                        pos,
+                    )
+            except Exception:
+                return False
+            phase.rows = len(node_index)
 
-        except sql.Error as e:
-            print("Connection failed: ", e)
-        return []
+        self._file_hashes = file_hashes
+        self._node_index = node_index
+        self._adjacency = adjacency
+        self.__attach_backlinks()
+        self.__collect_orphans()
+        return True
 
-    def __init_titles(self, dbpath: str) -> list[str]:
-        """
-        Initialize list of titles for each node
+    def __save_snapshot(self, path: str) -> None:
+        """Write node index and adjacency structure to a snapshot
+
+        The snapshot is written to a temporary file first and moved into place, so
+        concurrent readers never see a partially written snapshot. Miscellaneous
+        links are loaded to be included, so warm starts never read the database.
 
         Parameters
         ----------
-        dbpath : ``str``
-               Path to org-roam database
-
-
-        Returns
-        -------
-        List of node titles
+        path : ``str``
+            Path of snapshot file
         """
-        title_query = "SELECT title FROM nodes ORDER BY id ASC;"
-        try:
-            with sql.connect(dbpath, uri=True) as con:
-                csr = con.cursor()
-                query = csr.execute(title_query)
-                return [i[0].replace('"', "") for i in query.fetchall()]
-
-        except sql.Error as e:
-            print("Connection failed: ", e)
-        return []
+        with self._load_stats.phase("snapshot_save") as phase:
+            try:
+                nodes = [
+                    (
+                        node.id,
+                        node.title,
+                        node.fname,
+                        tuple(node.tags),
+                        tuple(
+                            (link.type, link.content, link.desc)
+                            for link in node.misc_links
+                        ),
+                        node.level,
+                        node.pos,
+                    )
+                    for node in self._node_index.values()
+                ]
+            except sql.Error as e:
+                print("Connection failed: ", e)
+                return
+            phase.rows = len(nodes)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+                with os.fdopen(fd, "wb") as f:
+                    key = self.__snapshot_key()
+                    pickle.dump(
+                        (key, self._file_hashes, nodes, self._adjacency),
+                        f,
+                        protocol=pickle.HIGHEST_PROTOCOL,
+                    )
+                os.replace(tmp, path)
+            except OSError as e:
+                warnings.warn(f"Could not write snapshot {path}: {e}")
 
-    def __init_tags(self, dbpath: str) -> list[set[str]]:
-        """
-        Initialize list of tags for each node
+    def __load_file_hashes(self, con: sql.Connection) -> dict[str, str]:
+        """Load content hashes of the files known to org-roam
 
         Parameters
         ----------
-        dbpath : ``str``
-                Path to org-roam database
+        con : ``sqlite3.Connection``
+            Connection to org-roam database
 
         Returns
         -------
-        List of node tags (as sets)
+        ``dict[str, str]``
+            Map with keys filenames and values the hash org-roam stored for them
         """
-        tags_query = "SELECT nodes.id, GROUP_CONCAT(tags.tag) AS tags FROM nodes LEFT JOIN tags ON nodes.id = tags.node_id GROUP BY nodes.id ORDER BY nodes.id ASC;"
-        try:
-            with sql.connect(dbpath, uri=True) as con:
-                csr = con.cursor()
-                query = csr.execute(tags_query)
-                clean = lambda s: s.replace('"', "")
-                match_null = lambda s: set() if not s else s.split(",")
-                return [set(map(clean, match_null(i[1]))) for i in query.fetchall()]
-
-        except sql.Error as e:
-            print("Connection failed: ", e)
-        return []
-
-    def __init_links_to(self, dbpath: str) -> list[list[str]]:
-        """Initialize list of links
+        clean = lambda s: s.replace('"', "")
+        with self._load_stats.phase("file_hashes") as phase:
+            file_hashes = {
+                clean(fname): clean(fhash)
+                for fname, fhash in iter_rows(
+                    con.execute("SELECT file, hash FROM files;"), self._batch_size
+                )
+            }
+            phase.rows = len(file_hashes)
+        return file_hashes
+
+    def __load_nodes(
+        self,
+        con: sql.Connection,
+        files: Optional[Iterable[str]] = None,
+        known_nodes: Optional[Mapping[str, RoamNode]] = None,
+    ) -> dict[str, RoamNode]:
+        """Load the node index of the collection
+
+        The ``nodes``, ``tags`` and ``links`` tables are each read exactly once
+        over a single connection, with nodes ordered by ID. Rows are fetched in
+        batches of ``_batch_size`` and folded directly into the ``RoamNode``
+        objects, so no per-column lists are built along the way and peak memory
+        stays close to the size of the finished node index. Repeated strings
+        (filenames, tags, link types and the IDs held in backlinks) are interned so
+        that every node shares one copy.
 
         Parameters
         ----------
-        dbpath : ``str``
-               Path to org-roam database
-
+        con : ``sqlite3.Connection``
+            Connection to org-roam database
+        files : ``Optional[Iterable[str]]``
+            Only load the nodes living in these files. All nodes are loaded if
+            ``None``
+        known_nodes : ``Optional[Mapping[str, RoamNode]]``
+            Nodes outside of the loaded ones that links may point to
 
         Returns
         -------
-        List of backlinks in node (as a list)
-        """
-        links_to_query = """
-        SELECT n.id,
-        GROUP_CONCAT(CASE WHEN l.type = '"id"' THEN l.dest END)
-        FROM nodes n
-        LEFT JOIN links l ON n.id = l.source
-        GROUP BY n.id
-        ORDER BY n.id ;
+        ``dict[str, RoamNode]``
+            Map with keys the ID of nodes and values the corresponding ``RoamNode``,
+            ordered ascending on the node IDs
         """
-        try:
-            with sql.connect(dbpath, uri=True) as con:
-                csr = con.cursor()
-                query = csr.execute(links_to_query)
-                clean = lambda s: s.replace('"', "")
-                links = query.fetchall()
-
-                # Separated links by comma might still have links we dont want (e.g. files, etc)
-                self_and_links = [
-                    [clean(i[0])] + list(map(clean, i[1].split(",")))
-                    if i[1]
-                    else [clean(i[0])]
-                    for i in links
-                ]
-
-                return self_and_links
-
-        except sql.Error as e:
-            print("Connection failed: ", e)
-        return []
-
-    def __init_misc_links(self, dbpath: str) -> list[list[OrgLink]]:
-        """Initialize list of miscellaneous org-mode links
+        conditions, params = [], []
+        selected, selection_params = self._selection.where()
+        if self._selection:
+            conditions.append(selected)
+            params.extend(selection_params)
+        if files is not None:
+            conditions.append("file IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps([f'"{fname}"' for fname in files]))
+
+        node_filter = tag_filter = link_filter = ""
+        link_params = params
+        if conditions:
+            node_filter = "WHERE " + " AND ".join(conditions)
+            tag_filter = f"WHERE node_id IN (SELECT id FROM nodes {node_filter})"
+            link_filter = f"WHERE source IN (SELECT id FROM nodes {node_filter})"
+        # Miscellaneous links are loaded on first access by _misc_loader
+        link_filter += " AND " if link_filter else "WHERE "
+        link_filter += """type = '"id"'"""
+        if self._selection:
+            # Links into nodes outside the selection are pruned by SQLite
+            link_filter += f" AND dest IN (SELECT id FROM nodes WHERE {selected})"
+            link_params = params + selection_params
+
+        nodes_query = f"SELECT id, file, title, level, pos FROM nodes {node_filter} ORDER BY id ASC;"
+        tags_query = f"SELECT node_id, tag FROM tags {tag_filter};"
+        links_query = f"SELECT source, dest FROM links {link_filter} ORDER BY dest;"
+
+        clean = lambda s: s.replace('"', "")
+        intern = lambda s: sys.intern(clean(s))
+        known_nodes = known_nodes or dict()
+        node_index = dict()
+        csr = con.cursor()
+        stats = self._load_stats
+        # Rows are folded in as they are fetched, so each phase covers the query,
+        # cleaning of the quoted values and building of the nodes together
+        with stats.phase("nodes") as phase:
+            rows = iter_rows(csr.execute(nodes_query, params), self._batch_size)
+            for ID, fname, title, level, pos in rows:
+                ID = clean(ID)
+                # By convention a node always links to itself
+                node_index[ID] = RoamNode(
+                    ID, clean(title), intern(fname), set(), [ID], None, level, pos
+                )
+                self._misc_loader.register(node_index[ID])
+            phase.rows = len(node_index)
+
+        with stats.phase("tags") as phase:
+            phase.rows = 0
+            rows = iter_rows(csr.execute(tags_query, params), self._batch_size)
+            for node_id, tag in rows:
+                phase.rows += 1
+                node = node_index.get(clean(node_id))
+                if node is not None and tag:
+                    node.tags.add(intern(tag))
+
+        with stats.phase("links") as phase:
+            phase.rows = 0
+            rows = iter_rows(csr.execute(links_query, link_params), self._batch_size)
+            for source, dest in rows:
+                phase.rows += 1
+                node = node_index.get(clean(source))
+                if node is None:
+                    continue
+                dest = clean(dest)
+                # In rare cases we'll pick up links to nonexistent nodes
+                target = node_index.get(dest) or known_nodes.get(dest)
+                if target is not None:
+                    node.backlinks.append(target.id)
+
+        return node_index
+
+    def __load_backlinks(
+        self, con: sql.Connection, sources: Iterable[str]
+    ) -> dict[str, list[str]]:
+        """Load the links to other nodes made by a collection of nodes
 
         Parameters
         ----------
-        dbpath : ``str``
-            path to org-roam database
+        con : ``sqlite3.Connection``
+            Connection to org-roam database
+        sources : ``Iterable[str]``
+            IDs of nodes to load links of
+
+        Returns
+        -------
+        ``dict[str, list[str]]``
+            Map with keys the given IDs and values their backlinks, restricted to
+            nodes in the collection
+        """
+        links_query = """SELECT source, dest FROM links
+                WHERE type = '"id"' AND source IN (SELECT value FROM json_each(?))
+                ORDER BY type, dest;"""
+        clean = lambda s: s.replace('"', "")
+        backlinks = {ID: [ID] for ID in sources}
+        params = (json.dumps([f'"{ID}"' for ID in backlinks]),)
+        rows = iter_rows(con.execute(links_query, params), self._batch_size)
+        for source, dest in rows:
+            target = self._node_index.get(clean(dest))
+            if target is not None:
+                backlinks[clean(source)].append(target.id)
+        return backlinks
+
+    def update(self) -> set[str]:
+        """Bring collection up to date with the org-roam database
+
+        The hashes org-roam keeps for each file are compared to the ones seen when
+        the collection was last loaded or updated. Only the nodes, tags and links of
+        files that were changed, added or deleted are read again and patched into
+        the node index in place. The ``networkx`` graph is rebuilt on its next
+        access.
+
+        If ``remove_orphans`` was called, the removed orphans are considered
+        again, so those that changed files now link to come back, and orphans
+        are removed again afterwards.
 
         Returns
         -------
-        ``list[OrgLink]``
-            List of OrgRoam links that are not other nodes (files, images,
-            internet links, etc)
+        ``set[str]``
+            Filenames that were reloaded or removed
+
+        Raises
+        ------
+        ``ValueError``
+            If the collection was derived from another one, e.g. by ``filter_tags``;
+            update the collection it came from and derive it again instead
 
+        Examples
+        --------
+        >>> collection = RoamGraph(PATH_TO_ORGROAM_DB)
+        >>> # ... edit notes in Emacs, org-roam syncs the database ...
+        >>> collection.update()
+        {'/home/user/org/roam/changed-note.org'}
         """
-        q = """SELECT n.id, GROUP_CONCAT(CASE WHEN l.type != '"id"' THEN l.dest END),
-                GROUP_CONCAT(CASE WHEN l.type != '"id"' THEN l.type END)
-                FROM
-                    nodes n
-                LEFT JOIN
-                    links l ON n.id = l.source
-                GROUP BY
-                    n.id
-                ORDER BY
-                    n.id;"""
+        if self._derived:
+            raise ValueError(
+                "Derived collections cannot be updated, update the collection "
+                "loaded from the database and derive again"
+            )
+        clean = lambda s: s.replace('"', "")
         try:
-            with sql.connect(dbpath, uri=True) as con:
-                csr = con.cursor()
-                clean = lambda s: s.replace('"', "")
-                quer = csr.execute(q)
-                output = quer.fetchall()
-                links_and_types = [
-                    list(
-                        zip(
-                            tuple(clean(row[1]).split(",")),
-                            tuple(clean(row[2]).split(",")),
-                        )
+            self._pool.invalidate()
+            with self._pool.connection() as con:
+                hashes = self.__load_file_hashes(con)
+                stale = {
+                    fname
+                    for fname in hashes.keys() | self._file_hashes.keys()
+                    if hashes.get(fname) != self._file_hashes.get(fname)
+                }
+                if not stale:
+                    return stale
+
+                index = self._node_index | self._removed_orphans
+                removed = {ID for ID, node in index.items() if node.fname in stale}
+                kept = {ID: node for ID, node in index.items() if ID not in removed}
+                # Nodes of reloaded files are registered again by __load_nodes,
+                # so their links are read in step with the new file hashes
+                self._misc_loader.discard(removed)
+                added = self.__load_nodes(
+                    con, [fname for fname in stale if fname in hashes], kept
+                )
+
+                # Nodes outside the stale files that link into them
+                sources_query = """SELECT DISTINCT source FROM links
+                        WHERE type = '"id"' AND dest IN (SELECT value FROM json_each(?));"""
+                params = (json.dumps([f'"{ID}"' for ID in removed | added.keys()]),)
+                affected = [
+                    clean(source)
+                    for (source,) in iter_rows(
+                        con.execute(sources_query, params), self._batch_size
                     )
-                    if row[1]
-                    else []
-                    for row in output
-                ]
-                return [
-                    [OrgLink(prop[1], prop[0], None) if prop else [] for prop in lst]
-                    for lst in links_and_types
+                    if clean(source) in kept
                 ]
 
+                self._node_index = dict(sorted((kept | added).items()))
+                self._removed_orphans = dict()
+                for ID, backlinks in self.__load_backlinks(con, affected).items():
+                    self._node_index[ID].backlinks = backlinks
+
         except sql.Error as e:
             print("Connection failed: ", e)
-        return []
+            return set()
+
+        # Dense rows shift whenever nodes come and go, so the CSR arrays are
+        # rebuilt in a single linear pass
+        self.__build_adjacency()
+
+        self.__build_title_index()
+        self.__build_tag_index()
+        self._file_hashes = hashes
+        self._misc_loader.file_hashes = hashes
+        self.__drop_search_index()
+        self._content_index = None
+        if self._orphans_removed:
+            self.remove_orphans()
+        return stale
 
     def remove_orphans(self) -> RoamGraph:
         """Remove orphans from network
@@ -415,38 +1051,19 @@ class RoamGraph:
         True
 
         """
-        indices_of_orphans = [
-            i for i in range(len(self.IDs)) if self.nodes[i] in self._orphans
-        ]
-
-        new_node_data = [
-            data
-            for idx, data in enumerate(
-                zip(
-                    self.IDs,
-                    self.titles,
-                    self.fnames,
-                    self._tags,
-                    self._links_to,
-                    self.misc_link_index.values(),
-                )
-            )
-            if idx not in indices_of_orphans
-        ]
-        new_node_index = {
-            j[0]: RoamNode(j[0], j[1], j[2], j[3], j[4], j[5]) for j in new_node_data
+        orphans = {node.id for node in self._orphans}
+        self._orphans_removed = True
+        self._removed_orphans.update((node.id, node) for node in self._orphans)
+        self._node_index = {
+            ID: node for ID, node in self._node_index.items() if ID not in orphans
         }
-        self._node_index = new_node_index
-
-        # Should be true by definition...
-        self._orphans = []
-        self._is_connected = True
-
-        self.db_path = self.db_path
-        self._graph = nx.MultiDiGraph(
-            {self.IDs[i]: self._links_to[i] for i in range(len(self.IDs))}
-        )
-        self._id_title_map = {self.IDs[i]: self.titles[i] for i in range(len(self.IDs))}
+        if self._content_index is not None:
+            self._content_index = {
+                ID: self._content_index[ID] for ID in self._node_index
+            }
+        self.__build_adjacency()
+        self.__build_title_index()
+        self.__build_tag_index()
         return self
 
     def __is_orphan(self, node: RoamNode) -> bool:
@@ -463,41 +1080,71 @@ class RoamGraph:
             True if node is an orphan
 
         """
-        pointed_to = True if any(node.id in n.backlinks for n in self.nodes) else False
-        points_to = node.backlinks != []
-        return not points_to and not pointed_to
+        r = self._adjacency.row[node.id]
+        return self._adjacency.in_degree(r) == 0 and self._adjacency.out_degree(r) == 0
+
+    def __build_adjacency(self) -> None:
+        """Build adjacency structure and orphan data of the collection
+
+        Every node is assigned a dense integer row following the order of
+        ``_node_index``, and its links are stored in CSR form in a single pass
+        over the edges. Links to nodes that are not in the collection are dropped.
+        The backlinks of the nodes are then served from their row, so no list of
+        IDs is kept next to the arrays. The cached ``networkx`` graph is
+        invalidated.
+        """
+        with self._load_stats.phase("adjacency") as phase:
+            self._adjacency = CSRAdjacency(
+                (ID, RoamNode.backlinks.links(node))
+                for ID, node in self._node_index.items()
+            )
+            self.__attach_backlinks()
+            phase.rows = self._adjacency.num_edges
+        self._graph = None
+        self.__collect_orphans()
 
-    def __identifier_type(self, identifier: str) -> IdentifierType:
-        """Determine type of identifier for node
+    def __attach_backlinks(self) -> None:
+        """Point the backlinks of every node to its row of ``_adjacency``"""
+        adjacency = self._adjacency
+        for node, r in zip(self._node_index.values(), range(len(adjacency))):
+            node.backlinks = _AdjacencyRow(adjacency, r)
+
+    def __collect_orphans(self) -> None:
+        """Collect orphans of the collection from the adjacency structure
+
+        The self-link every node carries by convention does not keep a node from
+        being an orphan.
+        """
+        with self._load_stats.phase("orphans") as phase:
+            IDs = self._adjacency.IDs
+            self._orphans = [
+                self._node_index[IDs[r]] for r in self._adjacency.isolated()
+            ]
+            phase.rows = len(self._orphans)
+        self._is_connected = self._orphans == []
+
+    def in_degree(self, identifier: str) -> int:
+        """Return number of links pointing to a node from other nodes
 
         Parameters
         ----------
         identifier : ``str``
-            identifier; node ID or title
+            Identifier for node. Can be title or ID
 
         Returns
         -------
-        ``IdentifierType``
-            Type of identifier
+        ``int``
+            Number of links from other nodes in the collection to the node
 
+        Raises
+        ------
+        ``AttributeError``
+            Raised if identifier cannot be found in the collection
         """
-        if identifier in self.IDs:
-            return IdentifierType.ID
-        elif identifier in self.titles:
-            if identifier in self._duplicate_titles:
-                warnings.warn(
-                    "This title is duplicated. This may not be the result you want",
-                    DuplicateTitlesWarning,
-                )
-            return IdentifierType.TITLE
-        else:
-            return IdentifierType.NOTHING
-
-    def node_links(self, identifier: str) -> list[str]:
-        """Return links for a particular node
+        return self._adjacency.in_degree(self._adjacency.row[self.node(identifier).id])
 
-        A node's links is the collection of links made in the body of the node desired.
-        By convention, a node will always refer to itself
+    def out_degree(self, identifier: str) -> int:
+        """Return number of links from a node to other nodes
 
         Parameters
         ----------
@@ -506,65 +1153,301 @@ class RoamGraph:
 
         Returns
         -------
-        ``list[str]``
-            List of IDs of nodes the provided node refers to
+        ``int``
+            Number of links from the node to other nodes in the collection
 
         Raises
         ------
         ``AttributeError``
             Raised if identifier cannot be found in the collection
         """
+        return self._adjacency.out_degree(
+            self._adjacency.row[self.node(identifier).id]
+        )
 
-        identifier_type = self.__identifier_type(identifier)
+    def neighbors(self, identifier: str) -> list[str]:
+        """Return IDs of the nodes a node links to
 
-        match identifier_type:
-            case IdentifierType.ID:
-                return self._node_index[identifier].backlinks
+        Parameters
+        ----------
+        identifier : ``str``
+            Identifier for node. Can be title or ID
 
-            case IdentifierType.TITLE:
-                idx = self.titles.index(identifier)
-                return self.nodes[idx].backlinks
+        Returns
+        -------
+        ``list[str]``
+            IDs of other nodes the node links to, without repetitions, in the order
+            the links were made
 
-            case IdentifierType.NOTHING:
-                raise AttributeError(f"No node with identifier: {identifier}")
+        Raises
+        ------
+        ``AttributeError``
+            Raised if identifier cannot be found in the collection
+        """
+        r = self._adjacency.row[self.node(identifier).id]
+        IDs = self._adjacency.IDs
+        return [IDs[t] for t in dict.fromkeys(self._adjacency.successors(r)) if t != r]
+
+    def __incoming_rows(self, r: int) -> list[str]:
+        """Return IDs of the other nodes linking to row ``r``, ascending"""
+        IDs = self._adjacency.IDs
+        return [
+            IDs[s] for s in dict.fromkeys(self._adjacency.predecessors(r)) if s != r
+        ]
 
-    def node(self, identifier: str) -> RoamNode:
-        """Return node object
+    def incoming_links(self, identifier: str) -> list[str]:
+        """Return IDs of the nodes linking to a node
 
-        Internally a node is of class ``orgroamtools.data.RoamNode``, which stores
-        basic information about a node like ID, title, filename, and its backlinks
+        ``RoamNode.backlinks`` holds the links a node makes. This is the reverse
+        direction, read from the incoming half of the adjacency structure, so the
+        lookup does not depend on the size of the collection.
 
         Parameters
         ----------
-        identifier : str
+        identifier : ``str``
             Identifier for node. Can be title or ID
 
         Returns
         -------
-        ``RoamNode``
-            RoamNode object of node
+        ``list[str]``
+            IDs of other nodes linking to the node, without repetitions, ordered
+            ascending
 
         Raises
         ------
         ``AttributeError``
-            Raised if node cannot be found
+            Raised if identifier cannot be found in the collection
+
+        Examples
+        --------
+        >>> [collection.node_title(ID) for ID in collection.incoming_links("group")]
+        ['monoid', 'ring']
         """
-        identifier_type = self.__identifier_type(identifier)
+        return self.__incoming_rows(self._adjacency.row[self.node(identifier).id])
 
-        match identifier_type:
-            case IdentifierType.TITLE:
-                idx = self.titles.index(identifier)
-                return self.nodes[idx]
+    def incoming_links_batch(self, identifiers: Iterable[str]) -> dict[str, list[str]]:
+        """Return IDs of the nodes linking to each of several nodes
 
-            case IdentifierType.ID:
-                idx = self.titles.index(identifier)
-                return self.nodes[idx]
+        Parameters
+        ----------
+        identifiers : ``Iterable[str]``
+            Identifiers for nodes. Can be titles or IDs
+
+        Returns
+        -------
+        ``dict[str, list[str]]``
+            dict with keys the given identifiers and values as in
+            ``incoming_links``
+
+        Raises
+        ------
+        ``AttributeError``
+            Raised if an identifier cannot be found in the collection
+        """
+        return {
+            identifier: self.incoming_links(identifier) for identifier in identifiers
+        }
+
+    @property
+    def incoming_link_index(self) -> dict[str, list[str]]:
+        """Return index of the nodes linking to each node of the collection
+
+        The reverse of ``backlink_index``.
+
+        Returns
+        -------
+        ``dict[str, list[str]]``
+            dict with keys the IDs of nodes and values the IDs of the other nodes
+            linking to them, as in ``incoming_links``
+        """
+        return {
+            ID: self.__incoming_rows(r) for r, ID in enumerate(self._adjacency.IDs)
+        }
+
+    def __build_title_index(self) -> None:
+        """Build title lookup data of the collection
+
+        Rebuilds the ID to title map, the title to IDs multimap and the list
+        of duplicated titles. Must be rerun whenever ``_node_index`` changes.
+        """
+        with self._load_stats.phase("title_index") as phase:
+            title_index = dict()
+            for ID, node in self._node_index.items():
+                title_index.setdefault(node.title, []).append(ID)
+            phase.rows = len(title_index)
+
+            self._title_index = title_index
+            self._id_title_map = {
+                ID: node.title for ID, node in self._node_index.items()
+            }
+        self._duplicate_titles = [
+            title for title, IDs in title_index.items() if len(IDs) > 1
+        ]
+        self._contains_dup_titles = len(self._duplicate_titles) > 0
+        if self._contains_dup_titles:
+            warnings.warn(
+                "Collection contains duplicate titles. Matching nodes by title will be non-exhaustive.",
+                DuplicateTitlesWarning,
+            )
+
+    def __build_tag_index(self) -> None:
+        """Build inverted tag index of the collection
+
+        Maps every tag to the set of IDs of the nodes carrying it. Must be rerun
+        whenever ``_node_index`` or the tags of its nodes change.
+        """
+        with self._load_stats.phase("tag_index") as phase:
+            tag_node_index = dict()
+            for ID, node in self._node_index.items():
+                for tag in node.tags:
+                    tag_node_index.setdefault(tag, set()).add(ID)
+            phase.rows = len(tag_node_index)
+        self._tag_node_index = tag_node_index
+
+    def __title_node(self, title: str) -> RoamNode:
+        """Return first node with provided title
+
+        Parameters
+        ----------
+        title : ``str``
+            Title of node
+
+        Returns
+        -------
+        ``RoamNode``
+            Node with lowest ID among the nodes carrying ``title``
+        """
+        return self._node_index[self._title_index[title][0]]
+
+    def __identifier_type(self, identifier: str) -> IdentifierType:
+        """Determine type of identifier for node
+
+        Parameters
+        ----------
+        identifier : ``str``
+            identifier; node ID or title
+
+        Returns
+        -------
+        ``IdentifierType``
+            Type of identifier
+
+        """
+        if identifier in self._node_index:
+            return IdentifierType.ID
+        elif identifier in self._title_index:
+            if len(self._title_index[identifier]) > 1:
+                warnings.warn(
+                    "This title is duplicated. This may not be the result you want",
+                    DuplicateTitlesWarning,
+                )
+            return IdentifierType.TITLE
+        else:
+            return IdentifierType.NOTHING
+
+    def node_links(self, identifier: str) -> list[str]:
+        """Return links for a particular node
+
+        A node's links is the collection of links made in the body of the node desired.
+        By convention, a node will always refer to itself
+
+        Parameters
+        ----------
+        identifier : ``str``
+            Identifier for node. Can be title or ID
+
+        Returns
+        -------
+        ``list[str]``
+            List of IDs of nodes the provided node refers to
+
+        Raises
+        ------
+        ``AttributeError``
+            Raised if identifier cannot be found in the collection
+        """
+
+        identifier_type = self.__identifier_type(identifier)
+
+        match identifier_type:
+            case IdentifierType.ID:
+                return RoamNode.backlinks.links(self._node_index[identifier])
+
+            case IdentifierType.TITLE:
+                return RoamNode.backlinks.links(self.__title_node(identifier))
+
+            case IdentifierType.NOTHING:
+                raise AttributeError(f"No node with identifier: {identifier}")
+
+    def node(self, identifier: str) -> RoamNode:
+        """Return node object
+
+        Internally a node is of class ``orgroamtools.data.RoamNode``, which stores
+        basic information about a node like ID, title, filename, and its backlinks
+
+        Parameters
+        ----------
+        identifier : str
+            Identifier for node. Can be title or ID
+
+        Returns
+        -------
+        ``RoamNode``
+            RoamNode object of node
+
+        Raises
+        ------
+        ``AttributeError``
+            Raised if node cannot be found
+        """
+        identifier_type = self.__identifier_type(identifier)
+
+        match identifier_type:
+            case IdentifierType.TITLE:
+                return self.__title_node(identifier)
+
+            case IdentifierType.ID:
+                return self._node_index[identifier]
 
             case IdentifierType.NOTHING:
                 raise AttributeError(f"No node with provided identifier: {identifier}")
 
         raise AttributeError("Uh oh spaghetti-o")
 
+    def resolve(self, identifiers: Iterable[str]) -> dict[str, list[RoamNode]]:
+        """Return all nodes matching each of a batch of identifiers
+
+        Unlike ``node``, a title shared by several nodes resolves to every
+        node carrying it, so no duplicate title warnings are raised.
+
+        Parameters
+        ----------
+        identifiers : ``Iterable[str]``
+            Identifiers for nodes. Each can be title or ID
+
+        Returns
+        -------
+        ``dict[str, list[RoamNode]]``
+            dict with keys the identifiers and values the list of matching nodes.
+            Identifiers that match nothing map to an empty list
+
+        Examples
+        --------
+        >>> matches = collection.resolve(["monoidal category", "foo bar baz"])
+        >>> matches["foo bar baz"]
+        []
+        """
+        resolved = dict()
+        for identifier in identifiers:
+            if identifier in self._node_index:
+                resolved[identifier] = [self._node_index[identifier]]
+            else:
+                resolved[identifier] = [
+                    self._node_index[ID]
+                    for ID in self._title_index.get(identifier, [])
+                ]
+        return resolved
+
     def node_title(self, identifier: str) -> str:
         """Return title of node
 
@@ -621,8 +1504,7 @@ class RoamGraph:
 
         match identifier_type:
             case IdentifierType.TITLE:
-                index_of_id = self.titles.index(identifier)
-                return self.IDs[index_of_id]
+                return self._title_index[identifier][0]
 
         raise AttributeError(f"No node with provided title: {identifier}")
 
@@ -639,7 +1521,8 @@ class RoamGraph:
         Returns
         -------
         ``RoamGraph``
-            Filtered collection (as a copy)
+            Filtered collection (as a copy). Links to nodes that were filtered out
+            are excised
 
         Examples
         --------
@@ -652,63 +1535,138 @@ class RoamGraph:
 
         """
 
-        subgraph = copy.deepcopy(self)
+        removed_tags = set(tags)
+        if exclude:
+            kept = self.select(tags_none=removed_tags)
+        else:
+            kept = self.select(tags_any=removed_tags)
 
-        new_nodes, excluded_ids = subgraph.__partitioned_nodes(tags, exclude)
+        return self._derive(
+            _replace_node(node, tags=node.tags - removed_tags) for node in kept.nodes
+        )
 
-        _ids = [node.id for node in new_nodes]
-        _titles = [node.title for node in new_nodes]
-        _fnames = [node.fname for node in new_nodes]
-        _misc_links = [node.misc_links for node in new_nodes]
+    def select(
+        self,
+        tags_all: Iterable[str] = (),
+        tags_any: Iterable[str] = (),
+        tags_none: Iterable[str] = (),
+    ) -> RoamGraphView:
+        """Return view of the nodes matching a boolean query on tags
 
-        # A node now cannot link to an excluded node, so excise them
-        _links_to = [
-            [link for link in node.backlinks if link not in excluded_ids]
-            for node in new_nodes
-        ]
-        subgraph._graph = nx.MultiDiGraph(
-            {_ids[i]: _links_to[i] for i in range(len(_titles))}
+        The query is answered from the inverted tag index by set operations,
+        without visiting the nodes. Conditions that are given are combined with
+        AND; a query with no conditions selects the whole collection.
+
+        Parameters
+        ----------
+        tags_all : ``Iterable[str]``
+            Tags a node must all have
+        tags_any : ``Iterable[str]``
+            Tags a node must have at least one of
+        tags_none : ``Iterable[str]``
+            Tags a node must have none of
+
+        Returns
+        -------
+        ``RoamGraphView``
+            View of the matching nodes
+
+        Examples
+        --------
+        >>> math = collection.select(tags_all={"math"}, tags_none={"draft"})
+        >>> "draft" in set().union(*math.tag_index.values())
+        False
+        """
+        return RoamGraphView(
+            self,
+            _select_tags(
+                self._tag_node_index, self._node_index, tags_all, tags_any, tags_none
+            ),
         )
 
-        seen = set()
-        subgraph._duplicate_titles = [x for x in _titles if x in seen or seen.add(x)]
-        subgraph._contains_dup_titles = len(subgraph._duplicate_titles) > 0
-        if subgraph._contains_dup_titles:
-            warnings.warn(
-                "Collection contains duplicate titles. Matching nodes by title will be non-exhaustive.",
-                DuplicateTitlesWarning,
-            )
+    def _derive(self, nodes: Iterable[RoamNode]) -> RoamGraph:
+        """Return new collection made of a subset of the nodes of this one
 
-        subgraph._id_title_map = {_ids[i]: _titles[i] for i in range(len(_ids))}
-
-        remove_tags = lambda taglist: list(set(taglist) - set(tags))
-        subgraph._node_index = {
-            j[0]: RoamNode(j[0], j[1], j[2], j[3], j[4], j[5])
-            for j in zip(
-                _ids,
-                _titles,
-                _fnames,
-                list(map(remove_tags, self._tags)),
-                _links_to,
-                _misc_links,
-            )
-        }
+        Nodes are shallow copies: tags, backlinks and miscellaneous links are new
+        containers, while the strings and ``OrgLink`` objects they hold are shared.
+        Links to nodes outside the subset are excised.
 
-        subgraph._orphans = [
-            node
-            for node in subgraph._node_index.values()
-            if not any(
-                [
-                    self._nodes_linked(node, other, directed=False)
-                    for other in subgraph._node_index.values()
-                    if other != node
-                ]
-            )
-        ]
+        Parameters
+        ----------
+        nodes : ``Iterable[RoamNode]``
+            Nodes of the new collection, in order
 
-        subgraph._is_connected = subgraph._orphans == []
+        Returns
+        -------
+        ``RoamGraph``
+            New collection on the same database
+        """
+        subgraph = self.init_empty()
+        subgraph.db_path = self.db_path
+        subgraph._pool = self._pool
+        subgraph._batch_size = self._batch_size
+        subgraph._selection = self._selection
+        subgraph._derived = True
+        subgraph._file_hashes = dict(self._file_hashes)
+        subgraph._graph_type = self._graph_type
+        subgraph._cache_dir = self._cache_dir
+        subgraph._load_stats = LoadStats(
+            self._load_stats.callback, self._load_stats.trace_memory
+        )
+        if self._pool is not None:
+            subgraph._misc_loader = _MiscLinkLoader(
+                self._pool, self._batch_size, subgraph._load_stats
+            )
+            subgraph._misc_loader.file_hashes = subgraph._file_hashes
+
+        nodes = list(nodes)
+        IDs = {node.id for node in nodes}
+        subgraph._node_index = dict()
+        for node in nodes:
+            copy = _replace_node(
+                node,
+                tags=set(node.tags),
+                backlinks=[
+                    link for link in RoamNode.backlinks.links(node) if link in IDs
+                ],
+            )
+            if RoamNode.misc_links.loaded(copy) is None:
+                if subgraph._misc_loader is not None:
+                    subgraph._misc_loader.register(copy)
+                else:
+                    copy.misc_links = []
+            subgraph._node_index[node.id] = copy
+
+        subgraph.__build_title_index()
+        subgraph.__build_tag_index()
+        subgraph.__build_adjacency()
         return subgraph
 
+    def view(self, IDs: Iterable[str]) -> RoamGraphView:
+        """Return read-only view of a subset of the collection
+
+        The view references the nodes of this collection instead of copying them,
+        so creating one costs memory proportional to the number of IDs only. Call
+        ``materialize`` on the view to get an independent ``RoamGraph``.
+
+        Parameters
+        ----------
+        IDs : ``Iterable[str]``
+            IDs of nodes in the view. IDs not in the collection are ignored
+
+        Returns
+        -------
+        ``RoamGraphView``
+            View of the nodes with the given IDs
+
+        Examples
+        --------
+        >>> first = collection.view(collection.IDs[:10])
+        >>> len(first.nodes)
+        10
+        """
+        return RoamGraphView(self, IDs)
+
     def _nodes_linked(
         self, node1: RoamNode, node2: RoamNode, directed: bool = True
     ) -> bool:
@@ -728,10 +1686,11 @@ class RoamGraph:
             True if nodes are connected
 
         """
+        links = RoamNode.backlinks.links
         if directed:
-            return node2.id in node1.backlinks
+            return node2.id in links(node1)
         else:
-            return node2.id in node1.backlinks or node1.id in node2.backlinks
+            return node2.id in links(node1) or node1.id in links(node2)
 
     def all_tags(self) -> set[str]:
         """Return collection of all tags present in network
@@ -741,48 +1700,7 @@ class RoamGraph:
         ``set[str]``
             Set of tags present in network
         """
-        return set(tag for node in self._node_index.values() for tag in node.tags)
-
-    def __partitioned_nodes(
-        self, tags: Iterable[str], exclude: bool = True
-    ) -> Tuple[list[RoamNode], list[str]]:
-        """Filter network by exact matches on tags
-
-        Parameters
-        ----------
-        tags : ``Iterable[str]``
-            Tags
-        exclude : ``bool``
-            Whether to exclude in new network or not
-
-        Returns
-        -------
-        ``Tuple[list[RoamNode], list[str]]``
-            Tuple containing list of nodes that survive filtering and list of IDs
-            that were purged
-
-        """
-        tfilter = [
-            any([tag in node.tags for tag in tags])
-            for node in self._node_index.values()
-        ]
-        if exclude:
-            tfilter = [not b for b in tfilter]
-            excluded_tags = tags
-            excluded_ids = [
-                node.id
-                for node in self._node_index.values()
-                if any(tag in node.tags for tag in excluded_tags)
-            ]
-        elif not exclude:
-            excluded_tags = self.all_tags() - set(tags)
-            excluded_ids = [
-                node.id
-                for node in self._node_index.values()
-                if not any(tag in node.tags for tag in excluded_tags)
-            ]
-
-        return ([node for (node, b) in zip(self.nodes, tfilter) if b], excluded_ids)
+        return set(self._tag_node_index)
 
     def _node_has_tag(self, node: RoamNode, tag: str) -> bool:
         """
@@ -806,36 +1724,50 @@ class RoamGraph:
         """Refresh ``_node_index``-dependent data in collection after
         manual change to ``self._node_index``.
         """
-        seen = set()
-        self._duplicate_titles = [x for x in self.titles if x in seen or seen.add(x)]
-        self._contains_dup_titles = len(self._duplicate_titles) > 0
-        if self._contains_dup_titles:
-            warnings.warn(
-                "Collection contains duplicate titles. Matching nodes by title will be non-exhaustive.",
-                DuplicateTitlesWarning,
-            )
+        self.__build_title_index()
+        self.__build_tag_index()
 
-        self._id_title_map = {self.IDs[i]: self.titles[i] for i in range(len(self.IDs))}
+        # Refresh backlinks to exclude those that were removed
+        for node in self._node_index.values():
+            node.backlinks = [
+                ID for ID in RoamNode.backlinks.links(node) if ID in self._node_index
+            ]
 
-        self._graph = nx.MultiDiGraph({node.id: node.backlinks for node in self.nodes})
+        self.__build_adjacency()
+        self.__drop_search_index()
+        self._content_index = None
 
-        self._orphans = [
-            node
-            for node in self._node_index.values()
-            if not any(
-                [
-                    self._nodes_linked(node, other, directed=False)
-                    for other in self._node_index.values()
-                    if other != node
-                ]
-            )
-        ]
+    def __drop_search_index(self) -> None:
+        """Close the full-text index, it is opened and synced again on next use"""
+        if self._search_index is not None:
+            self._search_index.close()
+            self._search_index = None
 
-        # Refresh backlinks to exclude those that were removed
-        for node in self._node_index.values():
-            node.backlinks = [ID for ID in node.backlinks if ID in self.IDs]
+    @property
+    def load_stats(self) -> list[PhaseStats]:
+        """Return timings of the phases run to load and index the collection
 
-        self._is_connected = self._orphans == []
+        Phases are recorded in the order they ran, including later rebuilds (by
+        ``update``, ``refresh``, ...), the lazy ``graph`` build and body
+        extraction. Their names are ``snapshot_load``, ``file_hashes``, ``nodes``,
+        ``tags``, ``links``, ``adjacency``, ``orphans``, ``snapshot_save``,
+        ``title_index``, ``tag_index``, ``misc_links``, ``graph``, ``bodies`` and
+        ``content``. Only the last ``MAX_LOAD_PHASES`` phases are kept.
+
+        Returns
+        -------
+        ``list[PhaseStats]``
+            Named tuples ``(PHASE, SECONDS, ROWS, PEAK_BYTES)``, with ``ROWS`` the
+            number of rows or items the phase processed and ``PEAK_BYTES`` the peak
+            memory it allocated, or ``None`` when memory was not traced
+
+        Examples
+        --------
+        >>> collection = RoamGraph(PATH_TO_ORGROAM_DB, trace_memory=True)
+        >>> for phase in collection.load_stats:
+        ...     print(f"{phase.phase}: {phase.seconds:.3f}s, {phase.rows} rows")
+        """
+        return list(self._load_stats.phases)
 
     @property
     def size(self) -> Tuple[int, int]:
@@ -846,7 +1778,61 @@ class RoamGraph:
         ``Tuple[int, int]``
             Tuple (num nodes , num links)
         """
-        return (len(self._node_index), nx.number_of_edges(self._graph))
+        return (len(self._node_index), self._adjacency.num_edges)
+
+    def memory_report(self) -> dict[str, int]:
+        """Return approximate memory used by each component of the collection
+
+        Every object is counted once, under the first component that reaches it,
+        in the order of the keys below. Strings shared between nodes thanks to
+        interning are therefore only counted once.
+
+        Returns
+        -------
+        ``dict[str, int]``
+            dict with keys ``"strings"`` (IDs, titles, filenames), ``"tags"``,
+            ``"backlinks"``, ``"misc_links"``, ``"nodes"`` (the ``RoamNode``
+            objects themselves), ``"indices"``, ``"adjacency"``, ``"graph"`` and
+            ``"total"``, and values sizes in bytes
+
+        Examples
+        --------
+        >>> report = collection.memory_report()
+        >>> report["total"] == sum(v for k, v in report.items() if k != "total")
+        True
+        """
+        nodes = list(self._node_index.values())
+        seen = set()
+        strings = deep_sizeof(
+            (s for node in nodes for s in (node.id, node.title, node.fname)), seen
+        )
+        # Measured before the backlinks, which reference it
+        adjacency = deep_sizeof([self._adjacency], seen)
+        report = {
+            "strings": strings,
+            "tags": deep_sizeof((node.tags for node in nodes), seen),
+            "backlinks": deep_sizeof(
+                (RoamNode.backlinks.stored(node) for node in nodes), seen
+            ),
+            "misc_links": deep_sizeof(
+                (RoamNode.misc_links.loaded(node) for node in nodes), seen
+            ),
+            "nodes": deep_sizeof(nodes, seen),
+            "indices": deep_sizeof(
+                (
+                    self._node_index,
+                    self._title_index,
+                    self._tag_node_index,
+                    self._id_title_map,
+                    self._duplicate_titles,
+                ),
+                seen,
+            ),
+            "adjacency": adjacency,
+            "graph": deep_sizeof([self._graph], seen) if self._graph is not None else 0,
+        }
+        report["total"] = sum(report.values())
+        return report
 
     @property
     def _tags(self) -> list[set[str]]:
@@ -868,31 +1854,62 @@ class RoamGraph:
         ``list[list[str]]``
             List of backlinks for nodes
         """
-        return [node.backlinks for node in self._node_index.values()]
+        return [RoamNode.backlinks.links(node) for node in self._node_index.values()]
 
     @property
-    def graph(self) -> nx.MultiDiGraph:
+    def graph(self) -> Optional[nx.Graph]:
         """Return networkx graph representation of collection
 
         An org-roam collection naturally forms the structure of a
         multi directed graph: a graph with direction-sensitive edges
         allowing multiple edges between any two nodes.
 
+        The graph is built from the adjacency structure on first access and
+        cached until the collection changes. Its kind is set by the
+        ``graph_type`` the collection was created with.
+
         Returns
         -------
-        ``nx.MultiDiGraph``
-            Multi directed graph representation of the collection
+        ``Optional[nx.Graph]``
+            Multi directed graph representation of the collection, a weighted
+            directed graph with parallel edges collapsed, or ``None`` if the
+            collection was created with ``graph_type=None``
         """
-
+        if self._graph is None and self._graph_type is not None:
+            with self._load_stats.phase("graph") as phase:
+                self._graph = self.__build_graph()
+                phase.rows = self._graph.number_of_edges()
         return self._graph
 
+    def __build_graph(self) -> nx.Graph:
+        """Build networkx graph of the kind given by ``_graph_type``
+
+        Returns
+        -------
+        ``nx.Graph``
+            ``nx.MultiDiGraph`` or weighted ``nx.DiGraph`` of the collection
+        """
+        nx = import_optional("networkx", "RoamGraph.graph")
+        if self._graph_type == "weighted":
+            graph = nx.DiGraph()
+            graph.add_nodes_from(self._adjacency.IDs)
+            weights = Counter(self._adjacency.edges())
+            graph.add_weighted_edges_from(
+                (source, target, weight) for (source, target), weight in weights.items()
+            )
+        else:
+            graph = nx.MultiDiGraph()
+            graph.add_nodes_from(self._adjacency.IDs)
+            graph.add_edges_from(self._adjacency.edges())
+        return graph
+
     @graph.setter
-    def graph(self, value: nx.MultiDiGraph) -> None:
+    def graph(self, value: nx.Graph) -> None:
         """Setter for graph attribute
 
         Parameters
         ----------
-        value : ``nx.MultiDiGraph``
+        value : ``nx.Graph``
             new graph to set self._graph to
         """
 
@@ -914,7 +1931,9 @@ class RoamGraph:
             in the node
         """
 
-        return {node.id: node.backlinks for node in self._node_index.values()}
+        return {
+            ID: RoamNode.backlinks.links(node) for ID, node in self._node_index.items()
+        }
 
     @property
     def file_index(self) -> dict[str, str]:
@@ -954,6 +1973,7 @@ class RoamGraph:
             New node index
         """
         self._node_index = value
+        self.refresh()
 
     @property
     def fnames(self, base: bool = True) -> list[str]:
@@ -1019,7 +2039,9 @@ class RoamGraph:
             dict with keys IDs of nodes and values the list of backlinks in that
             node
         """
-        return {ID: node.backlinks for ID, node in self._node_index.items()}
+        return {
+            ID: RoamNode.backlinks.links(node) for ID, node in self._node_index.items()
+        }
 
     @property
     def misc_links(self) -> dict[str, list[OrgLink]]:
@@ -1033,11 +2055,159 @@ class RoamGraph:
         """
         return {key: node.misc_links for key, node in self._node_index.items()}
 
-    @property
-    def id_title_map(self) -> dict[str, str]:
-        """Return dictionary of how the network maps IDs to titles
+    def __query_misc_links(self, select: str, params: Iterable = ()) -> list[tuple]:
+        """Run a query over the miscellaneous links of the collection
 
-        Returns
+        Parameters
+        ----------
+        select : ``str``
+            Query reading from the table ``misc(node, type, dest)`` of the
+            unquoted links made by nodes of the collection. The function
+            ``url_host`` is available to it
+        params : ``Iterable``
+            Parameters of ``select``
+
+        Returns
+        -------
+        ``list[tuple]``
+            Rows of the query, empty if the database could not be read
+        """
+        if self._pool is None:
+            return []
+        query = f"""WITH misc AS (
+                SELECT replace(source, '"', '') AS node,
+                       replace(type, '"', '') AS type,
+                       replace(dest, '"', '') AS dest
+                FROM links
+                WHERE type != '"id"' AND source IN (SELECT value FROM json_each(?))
+            )
+            {select}"""
+        IDs = json.dumps([f'"{ID}"' for ID in self._node_index])
+        try:
+            with self._pool.connection() as con:
+                con.create_function("url_host", 1, url_host, deterministic=True)
+                return con.execute(query, (IDs, *params)).fetchall()
+        except sql.Error as e:
+            print("Connection failed: ", e)
+            return []
+
+    def link_types(self) -> dict[str, int]:
+        """Return number of miscellaneous links of each type
+
+        Counted by SQLite over the ``links`` table, without loading any
+        ``misc_links``.
+
+        Returns
+        -------
+        ``dict[str, int]``
+            dict with keys link types (e.g. ``"https"``, ``"file"``) and values the
+            number of links of that type made by nodes of the collection, most
+            common first
+
+        Examples
+        --------
+        >>> collection.link_types()
+        {'https': 120, 'file': 14, 'fuzzy': 2}
+        """
+        rows = self.__query_misc_links(
+            "SELECT type, count(*) FROM misc GROUP BY type ORDER BY 2 DESC, type;"
+        )
+        return dict(rows)
+
+    def links_of_type(self, link_type: str) -> list[Tuple[str, str]]:
+        """Return the miscellaneous links of one type
+
+        Parameters
+        ----------
+        link_type : ``str``
+            Type of links, e.g. ``"https"`` or ``"file"``
+
+        Returns
+        -------
+        ``list[Tuple[str, str]]``
+            ``(ID, DEST)`` of every link of type ``link_type``, ordered on node ID
+            and destination
+
+        Examples
+        --------
+        >>> collection.links_of_type("file")
+        [('0adf10d9-...', 'figures/trace_of_double_braiding.svg')]
+        """
+        return self.__query_misc_links(
+            "SELECT node, dest FROM misc WHERE type = ? ORDER BY node, dest;",
+            (link_type,),
+        )
+
+    def link_domains(
+        self, link_types: Iterable[str] = WEB_LINK_TYPES
+    ) -> dict[str, int]:
+        """Return number of web links to each domain
+
+        Parameters
+        ----------
+        link_types : ``Iterable[str]``
+            Types of links to count, ``WEB_LINK_TYPES`` by default
+
+        Returns
+        -------
+        ``dict[str, int]``
+            dict with keys lowercased hosts and values the number of links to them,
+            most linked first
+
+        Examples
+        --------
+        >>> collection.link_domains()
+        {'arxiv.org': 42, 'en.wikipedia.org': 17}
+        """
+        rows = self.__query_misc_links(
+            """SELECT url_host(dest) AS host, count(*) FROM misc
+            WHERE type IN (SELECT value FROM json_each(?)) AND host IS NOT NULL
+            GROUP BY host ORDER BY 2 DESC, host;""",
+            (json.dumps(list(link_types)),),
+        )
+        return dict(rows)
+
+    def nodes_linking_to(
+        self, domain: str, link_types: Iterable[str] = WEB_LINK_TYPES
+    ) -> list[str]:
+        """Return IDs of nodes with web links to a domain
+
+        Links to subdomains count too, so ``"arxiv.org"`` matches links to
+        ``export.arxiv.org``.
+
+        Parameters
+        ----------
+        domain : ``str``
+            Host to look for, e.g. ``"arxiv.org"``
+        link_types : ``Iterable[str]``
+            Types of links to consider, ``WEB_LINK_TYPES`` by default
+
+        Returns
+        -------
+        ``list[str]``
+            IDs of the nodes linking to ``domain``, ordered ascending
+
+        Examples
+        --------
+        >>> IDs = collection.nodes_linking_to("arxiv.org")
+        >>> [collection.node_title(ID) for ID in IDs]
+        ['modular category', 'fusion category']
+        """
+        domain = domain.lower()
+        rows = self.__query_misc_links(
+            """SELECT DISTINCT node FROM misc
+            WHERE type IN (SELECT value FROM json_each(?))
+                AND (url_host(dest) = ? OR url_host(dest) GLOB ?)
+            ORDER BY node;""",
+            (json.dumps(list(link_types)), domain, f"*.{domain}"),
+        )
+        return [ID for (ID,) in rows]
+
+    @property
+    def id_title_map(self) -> dict[str, str]:
+        """Return dictionary of how the network maps IDs to titles
+
+        Returns
         -------
         ``dic[str, str]``
             dict with keys node IDs and values the corresponding title of the
@@ -1091,7 +2261,163 @@ class RoamGraph:
             Index with value the body text of nodes
 
         """
-        return {node.id: node.body for node in self.nodes}
+        return self.extract_bodies()
+
+    def __nodes_by_file(self) -> dict[str, list[str]]:
+        """Group node IDs by the file containing them
+
+        Returns
+        -------
+        ``dict[str, list[str]]``
+            dict with keys filenames and values the IDs of nodes in that file
+        """
+        grouped = dict()
+        for node in sorted(
+            self._node_index.values(), key=lambda node: (node.fname, node.pos or 0)
+        ):
+            grouped.setdefault(node.fname, []).append(node.id)
+        return grouped
+
+    def iter_bodies(self, format: str = "plain") -> Iterator[Tuple[str, str]]:
+        """Yield body text of each node, one file at a time
+
+        Files are visited in order of filename and nodes within a file in the
+        order they appear in it. Only one parsed file is held in memory at a time,
+        so results are available as soon as the first file is read.
+
+        Parameters
+        ----------
+        format : ``str``
+            ``"plain"`` renders links as their descriptions, ``"raw"`` keeps the
+            org markup
+
+        Yields
+        ------
+        ``Tuple[str, str]``
+            Pairs ``(ID, BODY)`` of node IDs and their body text
+
+        Examples
+        --------
+        >>> for ID, body in collection.iter_bodies():
+        ...     process(body)
+        """
+        for fname, IDs in self.__nodes_by_file().items():
+            yield from file_bodies(fname, IDs, format).items()
+
+    def iter_math_snippets(self) -> Iterator[Tuple[str, list[str]]]:
+        """Yield LaTeX snippets of each node, one file at a time
+
+        Yields
+        ------
+        ``Tuple[str, list[str]]``
+            Pairs ``(ID, SNIPPETS)`` in the order of ``iter_bodies``
+        """
+        for ID, content in self.iter_content():
+            yield ID, content.math
+
+    def iter_src_blocks(self) -> Iterator[Tuple[str, list[Tuple[str, str]]]]:
+        """Yield source blocks of each node, one file at a time
+
+        Yields
+        ------
+        ``Tuple[str, list[Tuple[str, str]]]``
+            Pairs ``(ID, SRC_BLOCKS)`` in the order of ``iter_bodies``, with source
+            blocks in the form ``(LANGUAGE, BLOCK_BODY)``
+        """
+        for ID, content in self.iter_content():
+            yield ID, [(block.language, block.body) for block in content.src_blocks]
+
+    def iter_content(self) -> Iterator[Tuple[str, BodyContent]]:
+        """Yield scanned content of each node, one file at a time
+
+        Every raw body is scanned once for math snippets, source blocks and links
+        together (see ``scan_body``), and the headings of the node's subtree are
+        read from the parsed file.
+
+        Yields
+        ------
+        ``Tuple[str, BodyContent]``
+            Pairs ``(ID, CONTENT)`` in the order of ``iter_bodies``
+        """
+        for fname, IDs in self.__nodes_by_file().items():
+            yield from file_contents(fname, IDs).items()
+
+    @property
+    def content_index(self) -> dict[str, BodyContent]:
+        """Return index of scanned content of each node
+
+        Built on first access and cached until ``update`` or ``refresh``;
+        ``math_snippet_index``, ``src_block_index`` and the per-node getters
+        read from it once it exists.
+
+        Returns
+        -------
+        ``dict[str, BodyContent]``
+            dict with keys node IDs and values ``(MATH, SRC_BLOCKS, LINKS,
+            HEADINGS)`` of the node's body, as returned by ``scan_body``
+
+        Examples
+        --------
+        >>> content = collection.content_index[ID]
+        >>> [block.header_args for block in content.src_blocks]
+        [{':results': 'output'}]
+        """
+        if self._content_index is None:
+            with self._load_stats.phase("content") as phase:
+                content = dict(self.iter_content())
+                phase.rows = len(content)
+            self._content_index = {ID: content[ID] for ID in self._node_index}
+        return self._content_index
+
+    def __node_content(self, node: RoamNode) -> BodyContent:
+        """Return scanned content of node, from ``content_index`` if it is built"""
+        if self._content_index is not None and node.id in self._content_index:
+            return self._content_index[node.id]
+        return scan_body(node.get_body("raw"))
+
+    def extract_bodies(self, workers: Optional[int] = 1) -> dict[str, str]:
+        """Return index of body text for each node, parsing each file once
+
+        Nodes are grouped by file, and every file is parsed exactly once. With
+        more than one worker, files are handed out to a process pool.
+
+        Parameters
+        ----------
+        workers : ``Optional[int]``
+            Number of worker processes. ``1`` extracts in the calling process,
+            ``None`` uses every available core
+
+        Returns
+        -------
+        ``dict[str, str]``
+            Index with value the body text of nodes
+
+        Examples
+        --------
+        >>> bodies = collection.extract_bodies(workers=8)
+        >>> bodies == collection.body_index
+        True
+        """
+        with self._load_stats.phase("bodies") as phase:
+            if workers == 1:
+                bodies = dict(self.iter_bodies())
+            else:
+                grouped = self.__nodes_by_file()
+                workers = workers or os.cpu_count() or 1
+                chunksize = max(1, len(grouped) // (4 * workers))
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = executor.map(
+                        file_bodies,
+                        grouped.keys(),
+                        grouped.values(),
+                        chunksize=chunksize,
+                    )
+                    bodies = {
+                        ID: body for result in results for ID, body in result.items()
+                    }
+            phase.rows = len(bodies)
+
+        return {ID: bodies[ID] for ID in self._node_index}
 
     def get_body(self, identifier: str) -> str:
         """Return body of node
@@ -1114,13 +2440,221 @@ class RoamGraph:
         id_type = self.__identifier_type(identifier)
         match id_type:
             case IdentifierType.TITLE:
-                idx = self.titles.index(identifier)
-                return self.nodes[idx].body
+                return self.__title_node(identifier).body
             case IdentifierType.ID:
                 return self._node_index[identifier].body
             case IdentifierType.NOTHING:
                 raise AttributeError(f"No node with provided identifier: {identifier}")
 
+    def __async_semaphore(self) -> asyncio.Semaphore:
+        """Return semaphore bounding the executor jobs of ``aget_body``
+
+        A semaphore binds to the event loop that first waits on it, so every
+        running loop gets its own one.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._async_semaphores[loop] = asyncio.Semaphore(
+                ASYNC_CONCURRENCY
+            )
+        return semaphore
+
+    async def aget_body(
+        self, identifier: str, executor: Optional[Executor] = None
+    ) -> str:
+        """Return body of node without blocking the event loop
+
+        The body is read on ``executor``. At most ``ASYNC_CONCURRENCY`` reads
+        per collection and event loop run at once; further calls wait for a free
+        slot.
+
+        Parameters
+        ----------
+        identifier : ``str``
+            Node identifier. Can be ID or title
+        executor : ``Optional[Executor]``
+            Executor to read on, the event loop's default executor if ``None``
+
+        Returns
+        -------
+        ``str``
+            Body text of node
+
+        Raises
+        ------
+        ``AttributeError``
+            If no node matches identifier
+        """
+        node = self.node(identifier)
+        loop = asyncio.get_running_loop()
+        async with self.__async_semaphore():
+            return await loop.run_in_executor(executor, RoamNode.get_body, node)
+
+    async def aiter_bodies(
+        self,
+        concurrency: int = ASYNC_CONCURRENCY,
+        executor: Optional[Executor] = None,
+        format: str = "plain",
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """Yield body text of each node, reading files on an executor
+
+        Files are read ahead on ``executor``, at most ``concurrency`` at once, and
+        bodies are yielded in the order of ``iter_bodies``. Since files are read
+        by the module level ``file_bodies``, a ``ProcessPoolExecutor`` can be used
+        to parse them in parallel.
+
+        Parameters
+        ----------
+        concurrency : ``int``
+            Maximum number of files being read at once
+        executor : ``Optional[Executor]``
+            Executor to read on, the event loop's default executor if ``None``
+        format : ``str``
+            ``"plain"`` renders links as their descriptions, ``"raw"`` keeps the
+            org markup
+
+        Yields
+        ------
+        ``Tuple[str, str]``
+            Pairs ``(ID, BODY)`` of node IDs and their body text
+
+        Examples
+        --------
+        >>> async for ID, body in collection.aiter_bodies(concurrency=4):
+        ...     await process(body)
+        """
+        loop = asyncio.get_running_loop()
+        pending = deque()
+        try:
+            for fname, IDs in self.__nodes_by_file().items():
+                pending.append(
+                    loop.run_in_executor(executor, file_bodies, fname, IDs, format)
+                )
+                if len(pending) >= max(1, concurrency):
+                    for item in (await pending.popleft()).items():
+                        yield item
+            while pending:
+                for item in (await pending.popleft()).items():
+                    yield item
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def aextract_bodies(
+        self,
+        concurrency: int = ASYNC_CONCURRENCY,
+        executor: Optional[Executor] = None,
+    ) -> dict[str, str]:
+        """Return index of body text for each node without blocking the event loop
+
+        Parameters
+        ----------
+        concurrency : ``int``
+            Maximum number of files being read at once
+        executor : ``Optional[Executor]``
+            Executor to read on, the event loop's default executor if ``None``
+
+        Returns
+        -------
+        ``dict[str, str]``
+            Index with value the body text of nodes, as ``body_index``
+        """
+        bodies = {
+            ID: body async for ID, body in self.aiter_bodies(concurrency, executor)
+        }
+        return {ID: bodies[ID] for ID in self._node_index}
+
+    def search_index(self, path: Optional[str] = None) -> SearchIndex:
+        """Return full-text index of node bodies, bringing it up to date
+
+        The index is a SQLite FTS5 database kept next to the snapshots in
+        ``cache_dir``, or next to the ``org-roam`` database if the collection has
+        no ``cache_dir``. Only files whose hash changed since they were last
+        indexed are read; the index is synced once per load or ``update``. An
+        index opened before is closed when ``path`` opens another one.
+
+        Parameters
+        ----------
+        path : ``Optional[str]``
+            Location of the index, overriding the default one
+
+        Returns
+        -------
+        ``SearchIndex``
+            Synced index of the collection
+
+        Raises
+        ------
+        ``ValueError``
+            Raised if no ``path`` is given and the collection was loaded from an
+            in-memory connection
+        """
+        if path is None and self._search_index is not None:
+            return self._search_index
+
+        if path is None and self.db_path is None:
+            raise ValueError("Collection has no database file, pass a path")
+        if path is None:
+            digest = hashlib.sha1(os.path.abspath(self.db_path).encode()).hexdigest()
+            if self._cache_dir is not None:
+                os.makedirs(self._cache_dir, exist_ok=True)
+                path = os.path.join(self._cache_dir, f"{digest}.search")
+            else:
+                path = f"{os.path.splitext(self.db_path)[0]}-search.db"
+
+        index = SearchIndex(path)
+        index.sync(
+            ((node.id, node.title, node.fname) for node in self._node_index.values()),
+            self._file_hashes,
+        )
+        self.__drop_search_index()
+        self._search_index = index
+        return index
+
+    def search(
+        self, query: str, limit: int = 10, tags: Optional[Iterable[str]] = None
+    ) -> list[SearchHit]:
+        """Search titles and bodies of nodes
+
+        Answered from the full-text index (see ``search_index``), so no org file
+        is read unless it changed since it was indexed.
+
+        Parameters
+        ----------
+        query : ``str``
+            Query in SQLite FTS5 syntax, e.g. ``"group AND ring"`` or ``"alg*"``
+        limit : ``int``
+            Maximum number of results
+        tags : ``Optional[Iterable[str]]``
+            If given, only nodes carrying all of these tags are returned
+
+        Returns
+        -------
+        ``list[SearchHit]``
+            Hits ``(ID, TITLE, SNIPPET, SCORE)`` ordered best first, with matches
+            in the snippet enclosed in square brackets
+
+        Raises
+        ------
+        ``sqlite3.OperationalError``
+            Raised if ``query`` is not valid FTS5 syntax
+
+        Examples
+        --------
+        >>> for hit in collection.search("monoid*", limit=5, tags={"math"}):
+        ...     print(hit.title, hit.snippet)
+        """
+        index = self.search_index()
+        if tags is not None:
+            IDs = _select_tags(self._tag_node_index, self._node_index, tags, (), ())
+        elif len(index) > len(self._node_index):
+            # Shared with collections holding other nodes of the same database
+            IDs = self._node_index.keys()
+        else:
+            IDs = None
+        return index.search(query, limit, IDs)
+
     @property
     def math_snippet_index(self) -> dict[str, list[str]]:
         """Return latex snippet index
@@ -1131,7 +2665,7 @@ class RoamGraph:
         ``dict[str, list[str]]``
             Index of LaTeX snippets
         """
-        return {node.id: extract_math_snippets(node.body) for node in self.nodes}
+        return {ID: content.math for ID, content in self.content_index.items()}
 
     @property
     def adjacency_list(self) -> list[list[str]]:
@@ -1151,7 +2685,129 @@ class RoamGraph:
         ``list[list[str]]``
             Adjacency list of collection with node IDs to identify nodes
         """
-        return [[node.id, other] for node in self.nodes for other in node.backlinks]
+        return [[ID, other] for ID, other in self._adjacency.edges()]
+
+    @property
+    def row_index(self) -> dict[str, int]:
+        """Return map of node IDs to rows used by the array exports
+
+        Rows follow the order of ``IDs``, so ``IDs[row_index[ID]] == ID``. The
+        mapping is stable for a given set of nodes.
+
+        Returns
+        -------
+        ``dict[str, int]``
+            dict with keys node IDs and values their row
+        """
+        return dict(self._adjacency.row)
+
+    def __edge_arrays(self, self_loops: bool, symmetric: bool, collapse: bool):
+        """Return source and target rows of edges as ``numpy`` arrays
+
+        Parameters
+        ----------
+        self_loops : ``bool``
+            Keep edges from a node to itself
+        symmetric : ``bool``
+            Add the reverse of every edge
+        collapse : ``bool``
+            Merge parallel edges into one
+
+        Returns
+        -------
+        ``Tuple[numpy.ndarray, numpy.ndarray]``
+            Arrays of source rows and target rows
+        """
+        np = import_optional("numpy", "Array export")
+        adjacency = self._adjacency
+        offsets = np.frombuffer(
+            adjacency.out_offsets, dtype=f"i{adjacency.out_offsets.itemsize}"
+        )
+        targets = np.frombuffer(
+            adjacency.out_targets, dtype=f"i{adjacency.out_targets.itemsize}"
+        ).astype(np.int64)
+        sources = np.repeat(np.arange(len(adjacency), dtype=np.int64), np.diff(offsets))
+
+        if not self_loops:
+            keep = sources != targets
+            sources, targets = sources[keep], targets[keep]
+        if symmetric:
+            sources, targets = (
+                np.concatenate([sources, targets]),
+                np.concatenate([targets, sources]),
+            )
+        if collapse:
+            sources, targets = np.unique(np.stack([sources, targets]), axis=1)
+        return sources, targets
+
+    def edge_index(
+        self, self_loops: bool = False, symmetric: bool = False, collapse: bool = False
+    ):
+        """Return edges of the collection as a ``(2, E)`` array of rows
+
+        This is the ``edge_index`` layout used by graph neural network libraries
+        such as PyTorch Geometric. Rows are given by ``row_index``. Requires
+        ``numpy``.
+
+        Parameters
+        ----------
+        self_loops : ``bool``
+            Keep the links every node has to itself by convention
+        symmetric : ``bool``
+            Add the reverse of every edge
+        collapse : ``bool``
+            Merge parallel edges into one, sorting edges by source then target
+
+        Returns
+        -------
+        ``numpy.ndarray``
+            ``int64`` array with source rows in the first row and target rows in
+            the second
+
+        Examples
+        --------
+        >>> edges = collection.edge_index(symmetric=True, collapse=True)
+        >>> edges.shape[0]
+        2
+        """
+        np = import_optional("numpy", "edge_index")
+        return np.stack(self.__edge_arrays(self_loops, symmetric, collapse))
+
+    def adjacency_matrix(
+        self, self_loops: bool = False, symmetric: bool = False, collapse: bool = True
+    ):
+        """Return adjacency matrix of the collection as a sparse CSR matrix
+
+        Entry ``(i, j)`` counts the links from row ``i`` to row ``j``, with rows
+        given by ``row_index``. Requires ``numpy`` and ``scipy``.
+
+        Parameters
+        ----------
+        self_loops : ``bool``
+            Keep the links every node has to itself by convention
+        symmetric : ``bool``
+            Add the reverse of every edge
+        collapse : ``bool``
+            Merge parallel edges so that every entry is 0 or 1
+
+        Returns
+        -------
+        ``scipy.sparse.csr_matrix``
+            ``n x n`` adjacency matrix
+
+        Examples
+        --------
+        >>> A = collection.adjacency_matrix(symmetric=True)
+        >>> (A != A.T).nnz
+        0
+        """
+        np = import_optional("numpy", "adjacency_matrix")
+        sparse = import_optional("scipy.sparse", "adjacency_matrix")
+        sources, targets = self.__edge_arrays(self_loops, symmetric, collapse)
+        n = len(self._adjacency)
+        data = np.ones(len(sources), dtype=np.int64)
+        # Converting from COO sums the entries of parallel edges
+        return sparse.coo_matrix((data, (sources, targets)), shape=(n, n)).tocsr()
 
     def get_latex_snippets(self, identifier: str) -> list[str]:
         """Return latex snippets of node
@@ -1174,10 +2830,9 @@ class RoamGraph:
         id_type = self.__identifier_type(identifier)
         match id_type:
             case IdentifierType.ID:
-                return extract_math_snippets(self._node_index[identifier].body)
+                return self.__node_content(self._node_index[identifier]).math
             case IdentifierType.TITLE:
-                idx = self.titles.index(identifier)
-                return extract_math_snippets(self.nodes[idx].body)
+                return self.__node_content(self.__title_node(identifier)).math
             case IdentifierType.NOTHING:
                 raise AttributeError(f"No node with identifier: {identifier}")
 
@@ -1191,7 +2846,10 @@ class RoamGraph:
             Index of source blocks. Source blocks are identified by ``Tuple[LANGUAGE, BLOCK_BODY]``
 
         """
-        return {node.id: extract_src_blocks(node.body) for node in self.nodes}
+        return {
+            ID: [(block.language, block.body) for block in content.src_blocks]
+            for ID, content in self.content_index.items()
+        }
 
     def get_src_blocks(self, identifier: str) -> list[Tuple[str, str]]:
         """Return source blocks of node
@@ -1214,19 +2872,432 @@ class RoamGraph:
         id_type = self.__identifier_type(identifier)
         match id_type:
             case IdentifierType.ID:
-                return extract_src_blocks(self._node_index[identifier].body)
+                node = self._node_index[identifier]
             case IdentifierType.TITLE:
-                idx = self.titles.index(identifier)
-                return extract_src_blocks(self.nodes[idx].body)
+                node = self.__title_node(identifier)
             case IdentifierType.NOTHING:
                 raise AttributeError(f"No node with identifier: {identifier}")
+        return [
+            (block.language, block.body)
+            for block in self.__node_content(node).src_blocks
+        ]
+
+
+def _select_tags(
+    tag_node_index: Mapping[str, set[str]],
+    universe: Collection[str],
+    tags_all: Iterable[str],
+    tags_any: Iterable[str],
+    tags_none: Iterable[str],
+) -> set[str]:
+    """Evaluate a boolean tag query against an inverted tag index
+
+    Parameters
+    ----------
+    tag_node_index : ``Mapping[str, set[str]]``
+        Map with keys tags and values the IDs of nodes with that tag
+    universe : ``Collection[str]``
+        IDs the query is restricted to
+    tags_all, tags_any, tags_none : ``Iterable[str]``
+        AND, OR and NOT conditions of the query
+
+    Returns
+    -------
+    ``set[str]``
+        IDs matching every condition given
+    """
+    empty = frozenset()
+    candidates = [tag_node_index.get(tag, empty) for tag in set(tags_all)]
+    tags_any = set(tags_any)
+    if tags_any:
+        candidates.append(
+            set().union(*(tag_node_index.get(tag, empty) for tag in tags_any))
+        )
+
+    if candidates:
+        # Start from the smallest set so every later step only shrinks it
+        candidates.sort(key=len)
+        selected = {ID for ID in candidates[0] if ID in universe}
+        selected.intersection_update(*candidates[1:])
+    else:
+        selected = set(universe)
+    selected.difference_update(
+        *(tag_node_index.get(tag, empty) for tag in set(tags_none))
+    )
+    return selected
+
+
+class RoamGraphView:
+    """Read-only view of a subset of the nodes of a ``RoamGraph``.
+
+    A view holds a reference to its parent collection and the set of IDs it
+    shows. Nothing is copied: the ``RoamNode`` objects returned are the
+    parent's own, and ``graph`` is a ``networkx`` subgraph view of the parent's
+    graph. Links to nodes outside the view are hidden from the structural
+    accessors (``graph``, ``adjacency_list``, ``backlink_index``), but not from
+    ``RoamNode.backlinks`` itself.
+
+    A view reflects its parent: changes to the parent's nodes show through, and
+    nodes the parent drops (``remove_orphans``, ``update``, ``refresh``) leave the
+    view, so use ``materialize`` to take an independent copy.
+
+    Attributes
+    ----------
+    parent : ``RoamGraph``
+        Collection the view is taken of
+    """
+
+    def __init__(self, parent: RoamGraph, IDs: Iterable[str]):
+        """Initializes RoamGraphView object
+
+        Parameters
+        ----------
+        parent : ``RoamGraph``
+            Collection to take a view of
+        IDs : ``Iterable[str]``
+            IDs of nodes in the view. IDs not in ``parent`` are ignored
+        """
+        self.parent = parent
+        row = parent._adjacency.row
+        self._selected = frozenset(ID for ID in IDs if ID in row)
+        self._adjacency = None
+        self.__sync()
+
+    def __sync(self) -> None:
+        """Drop IDs the parent no longer holds, whenever its adjacency was rebuilt
+
+        Every change of the parent's nodes rebuilds its adjacency, so the IDs of
+        the view are checked again only then, and kept in the parent's row order.
+        """
+        adjacency = self.parent._adjacency
+        if adjacency is not self._adjacency:
+            row = adjacency.row
+            self.__IDs = sorted(
+                (ID for ID in self._selected if ID in row), key=row.__getitem__
+            )
+            self.__mask = frozenset(self.__IDs)
+            self._adjacency = adjacency
+
+    @property
+    def _IDs(self) -> list[str]:
+        """Return IDs of the view still held by the parent, in row order"""
+        self.__sync()
+        return self.__IDs
+
+    @property
+    def _mask(self) -> frozenset[str]:
+        """Return IDs of the view still held by the parent"""
+        self.__sync()
+        return self.__mask
+
+    def __len__(self) -> int:
+        return len(self._IDs)
+
+    def __contains__(self, ID: str) -> bool:
+        return ID in self._mask
+
+    def view(self, IDs: Iterable[str]) -> RoamGraphView:
+        """Return view of a subset of this view
 
+        Parameters
+        ----------
+        IDs : ``Iterable[str]``
+            IDs of nodes in the new view. IDs not in this view are ignored
 
-@dataclass
+        Returns
+        -------
+        ``RoamGraphView``
+            View on the same parent collection
+        """
+        return RoamGraphView(self.parent, (ID for ID in IDs if ID in self._mask))
+
+    def select(
+        self,
+        tags_all: Iterable[str] = (),
+        tags_any: Iterable[str] = (),
+        tags_none: Iterable[str] = (),
+    ) -> RoamGraphView:
+        """Return view of the nodes of this view matching a boolean query on tags
+
+        See ``RoamGraph.select`` for the meaning of the parameters.
+
+        Returns
+        -------
+        ``RoamGraphView``
+            View on the same parent collection
+        """
+        return RoamGraphView(
+            self.parent,
+            _select_tags(
+                self.parent._tag_node_index, self._mask, tags_all, tags_any, tags_none
+            ),
+        )
+
+    def materialize(self) -> RoamGraph:
+        """Return independent collection holding the nodes of the view
+
+        Returns
+        -------
+        ``RoamGraph``
+            New collection with copies of the nodes in the view, with links to nodes
+            outside of the view excised
+        """
+        return self.parent._derive(self.nodes)
+
+    def node(self, identifier: str) -> RoamNode:
+        """Return node object
+
+        Parameters
+        ----------
+        identifier : ``str``
+            Identifier for node. Can be title or ID
+
+        Returns
+        -------
+        ``RoamNode``
+            RoamNode object of node
+
+        Raises
+        ------
+        ``AttributeError``
+            Raised if node cannot be found in the view
+        """
+        if identifier in self._mask:
+            return self.parent._node_index[identifier]
+        for ID in self.parent._title_index.get(identifier, []):
+            if ID in self._mask:
+                return self.parent._node_index[ID]
+        raise AttributeError(f"No node with provided identifier: {identifier}")
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Return size of view
+
+        Returns
+        -------
+        ``Tuple[int, int]``
+            Tuple (num nodes , num links)
+        """
+        return (len(self._IDs), len(self.adjacency_list))
+
+    @property
+    def graph(self) -> Optional[nx.Graph]:
+        """Return networkx graph representation of view
+
+        Returns
+        -------
+        ``Optional[nx.Graph]``
+            Read-only subgraph view of the parent's graph, or ``None`` if the
+            parent builds no graph
+        """
+        graph = self.parent.graph
+        return None if graph is None else graph.subgraph(self._IDs)
+
+    @property
+    def node_index(self) -> dict[str, RoamNode]:
+        """Return index of nodes in view
+
+        Returns
+        -------
+        ``dict[str, RoamNode]``
+            dict with keys the IDs of nodes and values the RoamNode object
+            of the node with that ID
+        """
+        return {ID: self.parent._node_index[ID] for ID in self._IDs}
+
+    @property
+    def nodes(self) -> list[RoamNode]:
+        """Return list of nodes in view
+
+        Returns
+        -------
+        ``list[RoamNode]``
+            list of nodes in view
+        """
+        return [self.parent._node_index[ID] for ID in self._IDs]
+
+    @property
+    def IDs(self) -> list[str]:
+        """Return list of IDs present in view
+
+        Returns
+        -------
+        ``list[str]``
+            list of IDs in view
+        """
+        return list(self._IDs)
+
+    @property
+    def titles(self) -> list[str]:
+        """Return list of titles present in view
+
+        Returns
+        -------
+        ``list[str]``
+            list of titles of nodes in view
+        """
+        return [node.title for node in self.nodes]
+
+    @property
+    def fnames(self) -> list[str]:
+        """Return list of filenames in view
+
+        Returns
+        -------
+        ``list[str]``
+            list of basenames of files in view
+        """
+        return [os.path.basename(node.fname) for node in self.nodes]
+
+    @property
+    def id_title_map(self) -> dict[str, str]:
+        """Return dictionary of how the view maps IDs to titles
+
+        Returns
+        -------
+        ``dict[str, str]``
+            dict with keys node IDs and values the corresponding title of the
+            node
+        """
+        return {node.id: node.title for node in self.nodes}
+
+    @property
+    def title_index(self) -> dict[str, str]:
+        """Return dictionary of how the view maps IDs to titles
+
+        Synonym for ``id_title_map``.
+
+        Returns
+        -------
+        ``dict[str, str]``
+            dict with keys node IDs and values the corresponding title of the
+            node
+        """
+        return self.id_title_map
+
+    @property
+    def tag_index(self) -> dict[str, set[str]]:
+        """Return dictionary of IDs and the nodes' tag sets
+
+        Returns
+        -------
+        ``dict[str, set[str]]``
+            dict with keys node IDs and values the set of tags of the node
+        """
+        return {node.id: node.tags for node in self.nodes}
+
+    @property
+    def file_index(self) -> dict[str, str]:
+        """Return index of filenames of view
+
+        Returns
+        -------
+        ``dict[str, str]``
+            dict with keys the IDs of nodes and values the filename of the file
+            containing that node
+        """
+        return {node.id: node.fname for node in self.nodes}
+
+    @property
+    def backlink_index(self) -> dict[str, list[str]]:
+        """Return index for node backlinks of the view
+
+        Returns
+        -------
+        ``dict[str, list[str]]``
+            dict with keys the IDs of nodes and values the list of backlinks
+            in the node that stay inside the view
+        """
+        return {
+            node.id: [
+                other
+                for other in RoamNode.backlinks.links(node)
+                if other in self._mask
+            ]
+            for node in self.nodes
+        }
+
+    @property
+    def misc_links(self) -> dict[str, list[OrgLink]]:
+        """Return index of miscellaneous links of nodes in view
+
+        Returns
+        -------
+        ``dict[str, list[OrgLink]]``
+            dict with keys node IDs and values the list of miscellaneous links of
+            the node
+        """
+        return {node.id: node.misc_links for node in self.nodes}
+
+    def incoming_links(self, identifier: str) -> list[str]:
+        """Return IDs of the nodes in the view linking to a node
+
+        Parameters
+        ----------
+        identifier : ``str``
+            Identifier for node. Can be title or ID
+
+        Returns
+        -------
+        ``list[str]``
+            IDs of other nodes in the view linking to the node, without
+            repetitions, ordered as in the parent
+
+        Raises
+        ------
+        ``AttributeError``
+            Raised if node cannot be found in the view
+        """
+        node = self.node(identifier)
+        return [ID for ID in self.parent.incoming_links(node.id) if ID in self._mask]
+
+    @property
+    def incoming_link_index(self) -> dict[str, list[str]]:
+        """Return index of the nodes linking to each node of the view
+
+        Returns
+        -------
+        ``dict[str, list[str]]``
+            dict with keys the IDs of nodes and values the IDs of the other nodes
+            in the view linking to them
+        """
+        return {ID: self.incoming_links(ID) for ID in self._IDs}
+
+    @property
+    def adjacency_list(self) -> list[list[str]]:
+        """Return adjacency list of view
+
+        Returns
+        -------
+        ``list[list[str]]``
+            Adjacency list of view with node IDs to identify nodes
+        """
+        return [
+            [ID, other]
+            for ID, backlinks in self.backlink_index.items()
+            for other in backlinks
+        ]
+
+    @property
+    def body_index(self) -> dict[str, str]:
+        """Return index of body text for each node in view
+
+        Returns
+        -------
+        ``dict[str, str]``
+            Index with value the body text of nodes
+        """
+        return {node.id: node.body for node in self.nodes}
+
+
+@dataclass(slots=True, frozen=True)
 class OrgLink:
     """
     Store information about org links
 
+    Links are immutable, slotted values, so they are hashable and cheap to hold in
+    large numbers.
+
     Attributes
     ----------
     type : ``str``
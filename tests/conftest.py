@@ -0,0 +1,106 @@
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks.corpus import insert_file, open_database
+from orgroamtools.data import RoamGraph
+
+PATH = os.path.join(os.path.dirname(__file__), "org-roam.db")
+
+ALGEBRA = """:PROPERTIES:
+:ID: algebra
+:END:
+#+title: Algebra
+#+filetags: :math:
+
+Study of [[id:group][groups]] and \\(x + y\\).
+
+* Group
+:PROPERTIES:
+:ID: group
+:END:
+A set with an operation.
+#+begin_src python
+print("group")
+#+end_src
+** Subgroup
+Closed under the operation.
+* Ring
+:PROPERTIES:
+:ID: ring
+:END:
+Two operations, see [[https://arxiv.org/abs/1234][a paper]].
+\\[
+a \\cdot b
+\\]
+"""
+
+LONELY = """:PROPERTIES:
+:ID: lonely
+:END:
+#+title: Lonely
+
+Nobody links here.
+"""
+
+
+def write_collection(directory):
+    """Write a small org-roam collection and its database into ``directory``
+
+    Returns the path to the database.
+    """
+    algebra = str(directory / "algebra.org")
+    lonely = str(directory / "lonely.org")
+    group_pos = ALGEBRA.index("* Group") + 1
+    ring_pos = ALGEBRA.index("* Ring") + 1
+
+    db = str(directory / "org-roam.db")
+    con = open_database(db)
+    insert_file(
+        con,
+        algebra,
+        ALGEBRA,
+        [
+            ("algebra", 0, 1, "Algebra"),
+            ("group", 1, group_pos, "Group"),
+            ("ring", 1, ring_pos, "Ring"),
+        ],
+        [("algebra", "math"), ("group", "math"), ("group", "definition")],
+        [
+            (0, "algebra", "group", "id"),
+            (0, "ring", "algebra", "id"),
+            (0, "ring", "arxiv.org/abs/1234", "https"),
+        ],
+    )
+    insert_file(con, lonely, LONELY, [("lonely", 0, 1, "Lonely")], [], [])
+    con.commit()
+    con.close()
+    for fname, text in [(algebra, ALGEBRA), (lonely, LONELY)]:
+        with open(fname, "w") as f:
+            f.write(text)
+    return db
+
+
+def execute(db, *statements):
+    """Run ``statements`` on the database ``db`` and commit them
+
+    Each statement is a SQL string, or a tuple of a SQL string and its parameters.
+    """
+    con = sqlite3.connect(db)
+    for statement in statements:
+        if isinstance(statement, str):
+            statement = (statement,)
+        con.execute(*statement)
+    con.commit()
+    con.close()
+
+
+@pytest.fixture
+def roam_db(tmp_path):
+    return write_collection(tmp_path)
+
+
+@pytest.fixture
+def collection():
+    return RoamGraph(PATH)
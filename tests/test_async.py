@@ -0,0 +1,56 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from orgroamtools.data import ASYNC_CONCURRENCY, RoamGraph
+
+
+def test_aload(roam_db):
+    collection = asyncio.run(RoamGraph.aload(roam_db, graph_type=None))
+
+    assert collection.IDs == RoamGraph(roam_db).IDs
+    assert collection.graph is None
+
+
+def test_aget_body(roam_db):
+    collection = RoamGraph(roam_db)
+
+    async def bodies():
+        return await asyncio.gather(
+            *(collection.aget_body(ID) for ID in collection.IDs)
+        )
+
+    assert asyncio.run(bodies()) == [node.body for node in collection.nodes]
+    with pytest.raises(AttributeError):
+        asyncio.run(collection.aget_body("no such node"))
+
+
+def test_aget_body_across_event_loops(roam_db):
+    collection = RoamGraph(roam_db)
+    IDs = collection.IDs * (ASYNC_CONCURRENCY + 1)
+
+    async def bodies():
+        return await asyncio.gather(*(collection.aget_body(ID) for ID in IDs))
+
+    expected = [collection.node(ID).body for ID in IDs]
+    assert asyncio.run(bodies()) == expected
+    assert asyncio.run(bodies()) == expected
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 8])
+def test_aiter_bodies(roam_db, concurrency):
+    collection = RoamGraph(roam_db)
+
+    async def stream():
+        return [item async for item in collection.aiter_bodies(concurrency)]
+
+    assert asyncio.run(stream()) == list(collection.iter_bodies())
+
+
+def test_aextract_bodies_on_process_pool(roam_db):
+    collection = RoamGraph(roam_db)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        bodies = asyncio.run(collection.aextract_bodies(executor=executor))
+
+    assert bodies == collection.body_index
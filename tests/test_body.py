@@ -0,0 +1,182 @@
+import os
+
+import pytest
+
+from orgroamtools.data import RoamGraph, RoamNode
+from orgroamtools._utils import OrgFileCache, ORG_FILE_CACHE, seek_body, scan_body
+
+ORG_FILE = """:PROPERTIES:
+:ID: file-node
+:END:
+#+title: File node
+
+Preamble text.
+
+* First heading
+:PROPERTIES:
+:ID: first-node
+:END:
+First body.
+** Child heading
+Child body.
+* Second heading
+:PROPERTIES:
+:ID: second-node
+:END:
+Second body with \\(x^2\\).
+"""
+
+
+@pytest.fixture
+def org_file(tmp_path):
+    path = tmp_path / "note.org"
+    path.write_text(ORG_FILE)
+    ORG_FILE_CACHE.cache_clear()
+    return str(path)
+
+
+def make_node(ID, fname):
+    return RoamNode(ID, ID, fname, set(), [ID], [])
+
+
+def test_body_of_heading_node(org_file):
+    body = make_node("first-node", org_file).body
+    assert "First body." in body
+    assert "Child body." in body
+    assert "Second body" not in body
+
+
+def test_body_of_file_node(org_file):
+    body = make_node("file-node", org_file).body
+    assert "Preamble text." in body
+    assert "Second body" in body
+
+
+def test_body_of_unknown_node_is_empty(org_file):
+    assert make_node("missing-node", org_file).body == ""
+
+
+def test_file_cache_parses_once(org_file):
+    for ID in ["file-node", "first-node", "second-node"]:
+        make_node(ID, org_file).body
+
+    info = ORG_FILE_CACHE.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+    assert info.currsize == 1
+
+
+def test_file_cache_invalidated_on_change(org_file):
+    cache = OrgFileCache(maxsize=1)
+    assert "first-node" in cache.subtrees(org_file)
+
+    with open(org_file, "a") as f:
+        f.write("* Third heading\n:PROPERTIES:\n:ID: third-node\n:END:\n")
+
+    assert "third-node" in cache.subtrees(org_file)
+    assert cache.cache_info().misses == 2
+
+
+def heading_pos(ID):
+    """Character position of the heading of ``ID`` as org-roam records it"""
+    return ORG_FILE.rindex("\n*", 0, ORG_FILE.index(f":ID: {ID}")) + 2
+
+
+@pytest.mark.parametrize("ID", ["first-node", "second-node"])
+def test_seek_body_matches_parsed_body(org_file, ID):
+    node = make_node(ID, org_file)
+    parsed = node.body
+    node.level, node.pos = 1, heading_pos(ID)
+
+    assert seek_body(org_file, ID, node.pos, node.level) == parsed
+    assert node.body == parsed
+
+
+def test_seek_body_with_multibyte_text(tmp_path):
+    path = tmp_path / "unicode.org"
+    path.write_text("#+title: ∑ über\n" + ORG_FILE.split("\n", 3)[3])
+    text = path.read_text()
+    pos = text.index("* Second heading") + 1
+
+    assert "Second body" in seek_body(str(path), "second-node", pos, 1)
+
+
+def test_seek_body_stale_position(org_file):
+    pos = heading_pos("second-node")
+    assert seek_body(org_file, "first-node", pos, 1) is None
+    assert seek_body(org_file, "first-node", heading_pos("first-node"), 2) is None
+
+    node = make_node("first-node", org_file)
+    node.level, node.pos = 1, pos
+    assert "First body." in node.body
+
+
+def test_body_index_of_collection(roam_db):
+    collection = RoamGraph(roam_db)
+    bodies = collection.body_index
+
+    assert list(bodies) == collection.IDs
+    assert bodies == {node.id: node.body for node in collection.nodes}
+    assert "Nobody links here." in bodies["lonely"]
+
+
+def test_parallel_extract_bodies(roam_db):
+    collection = RoamGraph(roam_db)
+    assert collection.extract_bodies(workers=2) == collection.body_index
+
+
+def test_iter_bodies_in_file_order(roam_db):
+    collection = RoamGraph(roam_db)
+    streamed = collection.iter_bodies()
+
+    assert next(streamed)[0] == "algebra"
+    assert [ID for ID, _ in streamed] == ["group", "ring", "lonely"]
+    assert dict(collection.iter_bodies()) == collection.body_index
+
+
+def test_iter_math_snippets_and_src_blocks(roam_db):
+    collection = RoamGraph(roam_db)
+    snippets = dict(collection.iter_math_snippets())
+    blocks = dict(collection.iter_src_blocks())
+
+    assert snippets["ring"] == ["a \\cdot b"]
+    assert blocks["group"] == [("python", 'print("group")')]
+    assert blocks["lonely"] == []
+
+
+def test_scan_body():
+    content = scan_body(
+        "* Notes\n"
+        "See [[id:abc][a note]] and [[fuzzy]], with \\(x^2\\).\n"
+        "#+begin_src python :results output :var n=2\n"
+        "print('[[id:not-a-link]] \\\\(y\\\\)')\n"
+        "#+end_src\n"
+    )
+
+    assert content.math == ["x^2"]
+    assert content.links == [("id", "abc", "a note"), ("fuzzy", "fuzzy", None)]
+    assert content.headings == [(1, "Notes")]
+    [block] = content.src_blocks
+    assert block.language == "python"
+    assert block.header_args == {":results": "output", ":var": "n=2"}
+    assert "not-a-link" in block.body
+
+
+def test_content_index_projections(roam_db):
+    collection = RoamGraph(roam_db)
+    content = collection.content_index
+
+    assert list(content) == collection.IDs
+    assert content["ring"].links == [("https", "//arxiv.org/abs/1234", "a paper")]
+    assert collection.math_snippet_index == dict(collection.iter_math_snippets())
+    assert collection.src_block_index == dict(collection.iter_src_blocks())
+    assert collection.get_latex_snippets("Ring") == ["a \\cdot b"]
+    assert collection.content_index is content
+
+
+def test_content_index_headings(roam_db):
+    content = RoamGraph(roam_db).content_index
+
+    assert content["algebra"].headings == [(1, "Group"), (2, "Subgroup"), (1, "Ring")]
+    assert content["group"].headings == [(2, "Subgroup")]
+    assert content["ring"].headings == []
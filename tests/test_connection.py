@@ -0,0 +1,65 @@
+import sqlite3
+
+import pytest
+
+from orgroamtools.data import RoamGraph
+
+from .conftest import execute
+
+
+@pytest.mark.parametrize("access", ["rw", "ro", "immutable", "memory"])
+def test_access_modes_load_the_same(roam_db, access):
+    collection = RoamGraph(roam_db, access=access)
+    assert collection.node_index == RoamGraph(roam_db).node_index
+
+
+def test_invalid_access_mode(roam_db):
+    with pytest.raises(ValueError):
+        RoamGraph(roam_db, access="rwx")
+
+
+def test_read_only_connection_cannot_write(roam_db):
+    collection = RoamGraph(roam_db)
+    with collection._pool.connection() as con:
+        with pytest.raises(sqlite3.OperationalError):
+            con.execute("DELETE FROM nodes")
+
+
+def test_connection_is_reused_by_update(roam_db):
+    collection = RoamGraph(roam_db)
+    with collection._pool.connection() as con:
+        first = con
+
+    collection.update()
+    with collection._pool.connection() as con:
+        assert con is first
+
+
+@pytest.mark.parametrize("access", ["immutable", "memory"])
+def test_static_connections_see_updates(roam_db, access):
+    collection = RoamGraph(roam_db, access=access)
+    fname = collection.node("lonely").fname
+    execute(
+        roam_db,
+        ("""UPDATE files SET hash = '"new"' WHERE file = ?""", (f'"{fname}"',)),
+        """UPDATE nodes SET title = '"Alone"' WHERE id = '"lonely"'""",
+    )
+
+    assert collection.update() == {fname}
+    assert collection.node("lonely").title == "Alone"
+
+
+def test_existing_in_memory_connection(roam_db):
+    memory = sqlite3.connect(":memory:")
+    source = sqlite3.connect(roam_db)
+    source.backup(memory)
+    source.close()
+
+    collection = RoamGraph(memory)
+    collection.close()
+
+    assert collection.db_path is None
+    assert collection.node_index == RoamGraph(roam_db).node_index
+    assert memory.execute("SELECT COUNT(*) FROM nodes").fetchone() == (4,)
+    with pytest.raises(ValueError):
+        collection.search("group")
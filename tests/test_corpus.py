@@ -0,0 +1,51 @@
+from benchmarks.corpus import DOMAINS, CorpusSpec, generate_corpus
+from orgroamtools.data import RoamGraph
+from orgroamtools._utils import file_bodies, scan_body
+
+
+def test_generated_corpus_loads(tmp_path):
+    spec = CorpusSpec(nodes=60, headings_per_file=3, tags=5, seed=1)
+    collection = RoamGraph(generate_corpus(str(tmp_path), spec))
+
+    assert collection.size[0] == 60
+    assert len(set(collection.fnames)) == 15
+    assert collection.all_tags() <= {f"tag{i}" for i in range(5)}
+    assert any(node.level == 1 for node in collection.nodes)
+    for node in collection.nodes:
+        assert node.body == file_bodies(node.fname, [node.id])[node.id]
+        assert f"#+title: {node.title}" in node.body or node.level == 1
+
+
+def test_generated_corpus_is_reproducible(tmp_path):
+    spec = CorpusSpec(nodes=30, seed=7)
+    first = RoamGraph(generate_corpus(str(tmp_path / "a"), spec))
+    second = RoamGraph(generate_corpus(str(tmp_path / "b"), spec))
+
+    assert first.IDs == second.IDs
+    assert first.adjacency_list == second.adjacency_list
+
+
+def test_generated_corpus_records_every_link(tmp_path):
+    spec = CorpusSpec(nodes=200, headings_per_file=3, seed=2)
+    collection = RoamGraph(generate_corpus(str(tmp_path), spec))
+
+    # Bodies of file level nodes include their headings, so only headings are
+    # compared with their own links
+    for node in collection.nodes:
+        if node.level == 0:
+            continue
+        body_links = scan_body(node.get_body("raw")).links
+        web = sorted(link for kind, link, _ in body_links if kind == "https")
+        assert sorted(link.content for link in node.misc_links) == web
+    assert set(collection.link_domains()) <= set(DOMAINS)
+    assert collection.link_types()["https"] > 0
+
+
+def test_generated_headings_inherit_filetags(tmp_path):
+    spec = CorpusSpec(nodes=100, tags_per_node=3, seed=3)
+    collection = RoamGraph(generate_corpus(str(tmp_path), spec))
+
+    file_tags = {node.fname: node.tags for node in collection.nodes if node.level == 0}
+    assert any(file_tags.values())
+    for node in collection.nodes:
+        assert file_tags[node.fname] <= node.tags
@@ -0,0 +1,239 @@
+import typing
+
+import pytest
+
+from orgroamtools.data import RoamGraph
+
+from .conftest import PATH
+
+
+def test_degrees_exclude_self_links(collection):
+    for node in collection.nodes:
+        others = [ID for ID in node.backlinks if ID != node.id]
+        assert collection.out_degree(node.id) == len(others)
+
+    assert sum(map(collection.in_degree, collection.IDs)) == sum(
+        map(collection.out_degree, collection.IDs)
+    )
+
+
+def test_orphans_have_no_degree(collection):
+    assert len(collection._orphans) == 3
+    for node in collection._orphans:
+        assert collection.in_degree(node.id) == 0
+        assert collection.out_degree(node.id) == 0
+
+
+def test_remove_orphans(collection):
+    orphan_ids = {node.id for node in collection._orphans}
+    collection.remove_orphans()
+
+    assert collection._is_connected
+    assert orphan_ids.isdisjoint(collection.IDs)
+    assert collection.size == (135, 437)
+
+
+def test_view_shares_nodes(collection):
+    IDs = collection.IDs[::2]
+    view = collection.view(IDs + ["not-an-id"])
+
+    assert view.IDs == IDs
+    assert all(a is b for a, b in zip(view.nodes, map(collection.node, IDs)))
+    assert set(view.graph.nodes()) == set(IDs)
+    assert all(ID in view and other in view for ID, other in view.adjacency_list)
+    assert view.size == (len(IDs), view.graph.number_of_edges())
+
+
+def test_view_follows_parent(collection):
+    view = collection.view(collection.IDs)
+    orphan_ids = {node.id for node in collection._orphans}
+    collection.remove_orphans()
+
+    assert view.IDs == collection.IDs
+    assert orphan_ids.isdisjoint(view.node_index)
+    assert view.titles == collection.titles
+    assert len(view) == 135
+
+
+def test_view_materialize(collection):
+    view = collection.view(collection.IDs[:40]).view(collection.IDs[20:])
+    subgraph = view.materialize()
+
+    assert subgraph.IDs == collection.IDs[20:40]
+    assert subgraph.adjacency_list == view.adjacency_list
+    assert subgraph.node(view.IDs[0]) is not view.nodes[0]
+
+
+def test_filter_tags_leaves_original_untouched(collection):
+    before = {ID: set(tags) for ID, tags in collection.tag_index.items()}
+    filtered = collection.filter_tags(["reference", "definition"], exclude=False)
+
+    assert collection.tag_index == before
+    assert not {"reference", "definition"} & filtered.all_tags()
+    assert sorted(filtered.graph.nodes()) == sorted(filtered.IDs)
+
+
+def test_select_matches_scan(collection):
+    tags = collection.tag_index
+    some, other = sorted(collection.all_tags())[:2]
+
+    selected = collection.select(tags_all=[some], tags_none=[other])
+    assert selected.IDs == [
+        ID for ID, t in tags.items() if some in t and other not in t
+    ]
+    anyof = collection.select(tags_any=[some, other])
+    assert anyof.IDs == [ID for ID, t in tags.items() if t & {some, other}]
+    assert anyof.select(tags_all=[other]).IDs == [
+        ID for ID, t in tags.items() if other in t
+    ]
+    assert collection.select().IDs == collection.IDs
+    assert len(collection.select(tags_all=["no such tag"])) == 0
+
+
+def test_filter_tags_uses_tag_index(collection):
+    filtered = collection.filter_tags(["reference"])
+
+    assert filtered.size == (124, 403)
+    assert "reference" not in filtered._tag_node_index
+
+
+def test_adjacency_matches_backlinks(collection):
+    assert collection.adjacency_list == [
+        [node.id, other] for node in collection.nodes for other in node.backlinks
+    ]
+    assert collection.size == (138, collection.graph.number_of_edges())
+
+
+def test_backlinks_are_served_from_adjacency(collection):
+    node, other = collection.nodes[:2]
+    assert collection.memory_report()["backlinks"] <= 64 * collection.size[0]
+
+    node.backlinks.clear()
+    node.backlinks.extend([node.id, other.id])
+    collection.refresh()
+
+    assert collection.node(node.id).backlinks == [node.id, other.id]
+    assert collection.neighbors(node.id) == [other.id]
+    assert node.id in collection.incoming_links(other.id)
+    assert collection.memory_report()["backlinks"] <= 64 * collection.size[0]
+
+
+def test_neighbors(collection):
+    node = collection.node("monoidal category")
+    neighbors = collection.neighbors(node.id)
+
+    assert node.id not in neighbors
+    assert len(neighbors) == len(set(neighbors))
+    assert set(neighbors) == set(node.backlinks) - {node.id}
+
+
+def scanned_incoming_links(collection):
+    return {
+        ID: sorted(n.id for n in collection.nodes if n.id != ID and ID in n.backlinks)
+        for ID in collection.IDs
+    }
+
+
+def test_incoming_links(collection):
+    expected = scanned_incoming_links(collection)
+    assert collection.incoming_link_index == expected
+
+    title = "monoidal category"
+    ID = collection.node_id(title)
+    assert collection.incoming_links(title) == expected[ID]
+    assert collection.incoming_links_batch([ID, title]) == {
+        ID: expected[ID],
+        title: expected[ID],
+    }
+    with pytest.raises(AttributeError):
+        collection.incoming_links("foo bar baz")
+
+
+def test_incoming_links_follow_derived_collections(collection):
+    filtered = collection.filter_tags(["reference"])
+    assert filtered.incoming_link_index == scanned_incoming_links(filtered)
+
+    collection.remove_orphans()
+    assert collection.incoming_link_index == scanned_incoming_links(collection)
+
+    del collection.node_index[collection.IDs[0]]
+    collection.refresh()
+    assert collection.incoming_link_index == scanned_incoming_links(collection)
+
+
+def test_view_incoming_links(collection):
+    view = collection.select(tags_none=["reference"])
+    for ID, sources in view.incoming_link_index.items():
+        assert sources == [s for s in collection.incoming_links(ID) if s in view]
+
+
+def test_edge_index(collection):
+    np = pytest.importorskip("numpy")
+    rows = collection.row_index
+    edges = collection.edge_index(self_loops=True)
+
+    assert edges.shape == (2, collection.size[1])
+    assert [[collection.IDs[i], collection.IDs[j]] for i, j in edges.T] == (
+        collection.adjacency_list
+    )
+    assert rows[collection.IDs[7]] == 7
+
+    loopless = collection.edge_index()
+    assert not np.any(loopless[0] == loopless[1])
+
+    symmetric = collection.edge_index(symmetric=True, collapse=True)
+    pairs = set(map(tuple, symmetric.T))
+    assert all((j, i) in pairs for i, j in pairs)
+    assert len(pairs) == symmetric.shape[1]
+
+
+def test_adjacency_matrix(collection):
+    pytest.importorskip("scipy")
+    matrix = collection.adjacency_matrix(self_loops=True, collapse=False)
+
+    assert matrix.shape == (138, 138)
+    assert matrix.sum() == collection.size[1]
+    assert matrix.diagonal().min() >= 1
+
+    symmetric = collection.adjacency_matrix(symmetric=True)
+    assert (symmetric != symmetric.T).nnz == 0
+    assert symmetric.max() == 1
+    assert symmetric.diagonal().max() == 0
+
+
+def test_graph_is_built_lazily(collection):
+    assert collection._graph is None
+    graph = collection.graph
+
+    assert graph is collection.graph
+    assert graph.number_of_edges() == collection.size[1]
+
+    collection.remove_orphans()
+    assert collection.graph is not graph
+    assert collection.graph.number_of_nodes() == 135
+
+
+def test_weighted_graph():
+    collection = RoamGraph(PATH, graph_type="weighted")
+    graph = collection.graph
+
+    assert not graph.is_multigraph()
+    assert graph.size(weight="weight") == collection.size[1]
+
+
+def test_no_graph():
+    collection = RoamGraph(PATH, graph_type=None)
+
+    assert collection.graph is None
+    assert collection.view(collection.IDs).graph is None
+    assert collection.size[0] == 138
+    assert len(collection.filter_tags(["reference"]).IDs) == 124
+
+    with pytest.raises(ValueError):
+        RoamGraph(PATH, graph_type="undirected")
+
+
+def test_graph_annotations_resolve():
+    nx = pytest.importorskip("networkx")
+    hints = typing.get_type_hints(RoamGraph.graph.fget)
+    assert hints["return"] == typing.Optional[nx.Graph]
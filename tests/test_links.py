@@ -0,0 +1,142 @@
+import pickle
+import sqlite3
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from orgroamtools.data import RoamGraph, RoamNode, OrgLink
+
+from .conftest import execute
+
+
+def misc_link_loads(collection):
+    return [phase for phase in collection.load_stats if phase.phase == "misc_links"]
+
+
+def test_misc_links_load_on_first_access(roam_db):
+    collection = RoamGraph(roam_db)
+    assert misc_link_loads(collection) == []
+
+    ring = collection.node("ring")
+    assert ring.misc_links == [OrgLink("https", "arxiv.org/abs/1234", None)]
+    assert collection.node("algebra").misc_links == []
+    assert len(misc_link_loads(collection)) == 1
+
+
+def test_derived_collections_load_lazily(roam_db):
+    collection = RoamGraph(roam_db)
+    subcollection = collection.filter_tags(["definition"])
+
+    assert misc_link_loads(collection) == []
+    assert subcollection.misc_links == {
+        "algebra": [],
+        "lonely": [],
+        "ring": [OrgLink("https", "arxiv.org/abs/1234", None)],
+    }
+
+
+def test_pickled_node_keeps_links(roam_db):
+    ring = RoamGraph(roam_db).node("ring")
+    copy = pickle.loads(pickle.dumps(ring))
+
+    assert copy == ring
+    assert copy.misc_links == [OrgLink("https", "arxiv.org/abs/1234", None)]
+
+
+def test_link_queries(roam_db):
+    collection = RoamGraph(roam_db)
+
+    assert collection.link_types() == {"https": 1}
+    assert collection.links_of_type("https") == [("ring", "arxiv.org/abs/1234")]
+    assert collection.links_of_type("file") == []
+    assert collection.link_domains() == {"arxiv.org": 1}
+    assert collection.nodes_linking_to("arXiv.org") == ["ring"]
+    assert collection.nodes_linking_to("org") == ["ring"]
+    assert collection.nodes_linking_to("xiv.org") == []
+    assert misc_link_loads(collection) == []
+
+
+def test_link_queries_stay_in_collection(roam_db):
+    collection = RoamGraph(roam_db).filter_tags(["math"], exclude=False)
+
+    assert collection.link_types() == {}
+    assert collection.nodes_linking_to("arxiv.org") == []
+
+
+def test_repr_and_equality_do_not_load_links(roam_db):
+    collection = RoamGraph(roam_db)
+    ring = collection.node("ring")
+
+    assert "misc_links" not in repr(ring)
+    assert ring == RoamGraph(roam_db).node("ring")
+    assert misc_link_loads(collection) == []
+
+
+def test_concurrent_first_access(roam_db):
+    collection = RoamGraph(roam_db)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        links = list(executor.map(lambda node: node.misc_links, collection.nodes * 8))
+
+    assert all(node_links is not None for node_links in links)
+    assert len(misc_link_loads(collection)) == 1
+
+
+def test_links_of_changed_files_warn_until_update(roam_db):
+    collection = RoamGraph(roam_db)
+    execute(roam_db, """UPDATE files SET hash = '"changed"'""")
+
+    with pytest.warns(UserWarning, match="Call update"):
+        collection.node("ring").misc_links
+
+    collection.update()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert collection.node("ring").misc_links == [
+            OrgLink("https", "arxiv.org/abs/1234", None)
+        ]
+
+
+def test_first_access_during_update(roam_db):
+    collection = RoamGraph(roam_db)
+    for i in range(50):
+        execute(roam_db, f"""UPDATE files SET hash = '"{i}"'""")
+        threads = [
+            threading.Thread(target=collection.update, daemon=True),
+            threading.Thread(
+                target=lambda: [node.misc_links for node in collection.nodes],
+                daemon=True,
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+            assert not thread.is_alive()
+
+    assert collection.node("ring").misc_links == [
+        OrgLink("https", "arxiv.org/abs/1234", None)
+    ]
+
+
+def test_failed_load_is_retried(roam_db):
+    memory = sqlite3.connect(":memory:")
+    source = sqlite3.connect(roam_db)
+    source.backup(memory)
+    source.close()
+    collection = RoamGraph(memory)
+    ring = collection.node("ring")
+
+    # The connection only works on the thread that created it
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(sqlite3.ProgrammingError):
+            executor.submit(lambda: ring.misc_links).result()
+
+    assert ring.misc_links == [OrgLink("https", "arxiv.org/abs/1234", None)]
+
+
+def test_loader_is_not_a_node_field():
+    assert "_misc_loader" not in RoamNode.__match_args__
+    with pytest.raises(TypeError):
+        RoamNode("id", "title", "fname", set(), [], [], 0, None, None)
@@ -0,0 +1,145 @@
+import logging
+import tracemalloc
+
+import pytest
+
+from orgroamtools.data import RoamGraph, OrgLink
+from orgroamtools._utils import DuplicateTitlesWarning, LoadStats
+
+from .conftest import PATH
+
+
+def test_loader_node_count(collection):
+    assert len(collection.nodes) == 138
+    assert collection.IDs == sorted(collection.IDs)
+
+
+def test_loader_node_fields(collection):
+    node = collection.node_index["0adf10d9-1ea5-4db2-a8bb-6641fab04ea3"]
+    assert node.title == "modular category"
+    assert node.tags == {"definition"}
+    assert node.backlinks[0] == node.id
+    assert "02790fa5-0095-4320-b7c8-225f269fb335" in node.backlinks
+    assert node.misc_links == [
+        OrgLink("file", "figures/trace_of_double_braiding.svg", None)
+    ]
+
+
+def test_loader_keeps_commas_in_links(collection):
+    node = collection.node_index["e8b7e2cf-6e72-4477-8e7c-98d462d5065b"]
+    assert node.misc_links[0].content.startswith("*Rowell, E. C. (2005)")
+
+
+def test_resolve_by_id_and_title(collection):
+    node_id = collection.node_id("monoidal category")
+    resolved = collection.resolve([node_id, "monoidal category", "foo bar baz"])
+
+    assert resolved[node_id] == [collection.node(node_id)]
+    assert resolved["monoidal category"] == [collection.node("monoidal category")]
+    assert resolved["foo bar baz"] == []
+
+
+def test_resolve_duplicate_titles(collection):
+    node = collection.nodes[0]
+    twin = collection.nodes[1]
+    twin.title = node.title
+    with pytest.warns(DuplicateTitlesWarning):
+        collection.refresh()
+
+    assert [n.id for n in collection.resolve([node.title])[node.title]] == sorted(
+        [node.id, twin.id]
+    )
+
+
+def test_loader_interns_repeated_strings(collection):
+    by_tag = {}
+    for node in collection.nodes:
+        assert not hasattr(node, "__dict__")
+        for tag in node.tags:
+            assert by_tag.setdefault(tag, tag) is tag
+        for other in node.backlinks:
+            assert other is collection.node_index[other].id
+
+
+def test_memory_report(collection):
+    collection.graph
+    report = collection.memory_report()
+
+    assert set(report) == {
+        "strings",
+        "tags",
+        "backlinks",
+        "misc_links",
+        "nodes",
+        "indices",
+        "adjacency",
+        "graph",
+        "total",
+    }
+    assert all(size > 0 for size in report.values())
+    assert report["total"] == sum(v for k, v in report.items() if k != "total")
+
+
+def test_load_stats(roam_db, caplog):
+    seen = []
+    with caplog.at_level(logging.DEBUG, logger="orgroamtools"):
+        collection = RoamGraph(roam_db, on_phase=seen.append, trace_memory=True)
+    stats = {phase.phase: phase for phase in collection.load_stats}
+
+    assert seen == collection.load_stats
+    assert {"file_hashes", "nodes", "tags", "links", "adjacency"} <= set(stats)
+    assert stats["nodes"].rows == 4
+    assert stats["links"].rows == 2
+    assert "misc_links" not in stats
+    assert all(phase.seconds >= 0 and phase.peak_bytes >= 0 for phase in seen)
+    assert "phase nodes took" in caplog.text
+
+    collection.body_index
+    assert collection.load_stats[-1].phase == "bodies"
+    assert collection.load_stats[-1].rows == 4
+
+
+def test_nested_phase_keeps_outer_peak():
+    stats = LoadStats(trace_memory=True)
+    with stats.phase("outer"):
+        block = bytearray(1 << 20)
+        del block
+        with stats.phase("inner"):
+            pass
+
+    inner, outer = stats.phases
+    assert inner.peak_bytes < 1 << 20 <= outer.peak_bytes
+
+
+def test_load_stats_are_bounded():
+    stats = LoadStats(max_phases=3)
+    for name in "abcde":
+        with stats.phase(name):
+            pass
+
+    assert [phase.phase for phase in stats.phases] == ["c", "d", "e"]
+
+
+def test_load_stats_without_memory_tracing(roam_db):
+    collection = RoamGraph(roam_db)
+    assert all(phase.peak_bytes is None for phase in collection.load_stats)
+
+
+def test_batched_load_matches(collection):
+    batched = RoamGraph(PATH, batch_size=7)
+
+    assert batched.IDs == sorted(batched.IDs)
+    assert batched.node_index == collection.node_index
+    assert batched.size == collection.size
+
+
+def test_load_peak_memory_close_to_final():
+    tracemalloc.start()
+    try:
+        collection = RoamGraph(PATH, batch_size=16)
+        final, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert collection.size[0] == 138
+    assert peak < 1.5 * final
@@ -0,0 +1,84 @@
+import sqlite3
+
+import pytest
+
+from orgroamtools.data import RoamGraph
+from orgroamtools._utils import SearchIndex
+
+from .conftest import execute
+
+
+def test_search_ranks_and_snippets(roam_db):
+    collection = RoamGraph(roam_db)
+    hits = collection.search("operation*")
+
+    # File level nodes include the bodies of their headings
+    assert {hit.id for hit in hits} == {"algebra", "group", "ring"}
+    assert [hit.score for hit in hits] == sorted(hit.score for hit in hits)
+    assert all("[operation" in hit.snippet for hit in hits)
+    assert [hit.title for hit in collection.search("nobody")] == ["Lonely"]
+    assert len(collection.search("operation*", limit=1)) == 1
+
+
+def test_search_by_tags(roam_db):
+    collection = RoamGraph(roam_db)
+
+    hits = collection.search("operation*", tags=["math"])
+    assert {hit.id for hit in hits} == {"algebra", "group"}
+    assert collection.search("operation*", tags=["math", "nonexistent"]) == []
+
+
+def test_search_index_is_incremental(roam_db, tmp_path):
+    collection = RoamGraph(roam_db, cache_dir=tmp_path / "cache")
+    path = collection.search_index().path
+    assert len(SearchIndex(path)) == 4
+
+    assert SearchIndex(path).sync(
+        ((node.id, node.title, node.fname) for node in collection.nodes),
+        collection._file_hashes,
+    ) == 0
+
+    lonely = collection.node("lonely").fname
+    with open(lonely, "a") as f:
+        f.write("Now with a hedgehog.\n")
+    execute(
+        roam_db,
+        ("""UPDATE files SET hash = '"new"' WHERE file = ?""", (f'"{lonely}"',)),
+    )
+
+    assert collection.search("hedgehog") == []
+    collection.update()
+    assert [hit.id for hit in collection.search("hedgehog")] == ["lonely"]
+
+
+def test_search_on_derived_collection(roam_db):
+    collection = RoamGraph(roam_db)
+    collection.search("operation*")
+    filtered = collection.filter_tags(["definition"])
+
+    assert {hit.id for hit in filtered.search("operation*")} == {"algebra", "ring"}
+
+
+def test_refresh_closes_search_index(roam_db):
+    collection = RoamGraph(roam_db)
+    index = collection.search_index()
+    collection.refresh()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        len(index)
+    assert {hit.id for hit in collection.search("operation*")} == {
+        "algebra",
+        "group",
+        "ring",
+    }
+
+
+def test_search_index_path_closes_previous_index(roam_db, tmp_path):
+    collection = RoamGraph(roam_db)
+    index = collection.search_index()
+    other = collection.search_index(str(tmp_path / "other.search"))
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        len(index)
+    assert len(other) == 4
+    assert collection.search_index() is other
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from orgroamtools.data import RoamGraph
+
+from .conftest import PATH, execute
+
+
+@pytest.mark.parametrize("tags", [["reference"], ["reference", "definition"]])
+def test_tag_selection_matches_filter_tags(tags):
+    selected = RoamGraph(PATH, tags=tags)
+    filtered = RoamGraph(PATH).filter_tags(tags, exclude=False)
+
+    assert selected.IDs == filtered.IDs
+    assert selected.adjacency_list == filtered.adjacency_list
+    assert all(set(tags) & node.tags for node in selected.nodes)
+
+
+def test_selectors(roam_db):
+    assert RoamGraph(roam_db, file_glob="*/lonely.org").IDs == ["lonely"]
+    assert RoamGraph(roam_db, title_like="%ING").IDs == ["ring"]
+    assert RoamGraph(roam_db, max_level=0).IDs == ["algebra", "lonely"]
+    assert RoamGraph(roam_db, tags=["math"], max_level=0).IDs == ["algebra"]
+    assert RoamGraph(roam_db, tags=["nonexistent"]).IDs == []
+
+
+def test_links_out_of_selection_are_pruned(roam_db):
+    selected = RoamGraph(roam_db, max_level=0)
+
+    assert selected.node("algebra").backlinks == ["algebra"]
+    assert selected.size == (2, 2)
+
+
+def test_update_keeps_selection(roam_db):
+    collection = RoamGraph(roam_db, max_level=0)
+    fname = collection.node("algebra").fname
+
+    execute(
+        roam_db,
+        ("""UPDATE files SET hash = '"new"' WHERE file = ?""", (f'"{fname}"',)),
+    )
+
+    assert collection.update() == {fname}
+    assert collection.IDs == ["algebra", "lonely"]
+
+
+def test_selections_have_own_snapshots(roam_db, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    RoamGraph(roam_db, cache_dir=cache_dir)
+    selected = RoamGraph(roam_db, cache_dir=cache_dir, max_level=0)
+
+    assert selected.IDs == ["algebra", "lonely"]
+    assert RoamGraph(roam_db, cache_dir=cache_dir).size[0] == 4
+    assert len(os.listdir(cache_dir)) == 2
@@ -0,0 +1,63 @@
+import os
+import sqlite3
+
+from orgroamtools.data import RoamGraph
+
+from .conftest import execute
+
+
+def snapshots(cache_dir):
+    return [os.path.join(cache_dir, f) for f in os.listdir(cache_dir)]
+
+
+def refuse_connections(*args, **kwargs):
+    raise AssertionError("database was read")
+
+
+def test_warm_start_skips_database(roam_db, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    cold = RoamGraph(roam_db, cache_dir=cache_dir)
+    assert len(snapshots(cache_dir)) == 1
+
+    monkeypatch.setattr(sqlite3, "connect", refuse_connections)
+    warm = RoamGraph(roam_db, cache_dir=cache_dir)
+
+    assert warm.node_index == cold.node_index
+    assert warm.adjacency_list == cold.adjacency_list
+    assert warm._orphans == cold._orphans
+    assert sorted(warm.graph.edges()) == sorted(cold.graph.edges())
+
+
+def test_stale_snapshot_is_rebuilt(roam_db, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    RoamGraph(roam_db, cache_dir=cache_dir)
+
+    execute(roam_db, """UPDATE nodes SET title = '"Rings"' WHERE id = '"ring"'""")
+
+    assert RoamGraph(roam_db, cache_dir=cache_dir).node("ring").title == "Rings"
+    assert RoamGraph(roam_db, cache_dir=cache_dir).node("ring").title == "Rings"
+
+
+def test_corrupt_snapshot_falls_back(roam_db, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    expected = RoamGraph(roam_db).node_index
+    RoamGraph(roam_db, cache_dir=cache_dir)
+    (path,) = snapshots(cache_dir)
+    with open(path, "wb") as f:
+        f.write(b"not a snapshot")
+
+    assert RoamGraph(roam_db, cache_dir=cache_dir).node_index == expected
+
+
+def refuse_locked(*args, **kwargs):
+    raise sqlite3.OperationalError("database is locked")
+
+
+def test_failed_load_is_not_cached(roam_db, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    with monkeypatch.context() as patch:
+        patch.setattr(sqlite3, "connect", refuse_locked)
+        assert RoamGraph(roam_db, cache_dir=cache_dir).size == (0, 0)
+
+    assert not os.path.exists(cache_dir) or snapshots(cache_dir) == []
+    assert RoamGraph(roam_db, cache_dir=cache_dir).size[0] == 4
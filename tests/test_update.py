@@ -0,0 +1,116 @@
+import pytest
+
+from orgroamtools.data import RoamGraph
+
+from .conftest import execute
+
+
+def assert_same_collection(updated, fresh):
+    assert updated.node_index == fresh.node_index
+    assert updated.adjacency_list == fresh.adjacency_list
+    for ID in fresh.IDs:
+        assert updated.in_degree(ID) == fresh.in_degree(ID)
+        assert updated.out_degree(ID) == fresh.out_degree(ID)
+    assert updated._orphans == fresh._orphans
+    assert updated.title_index == fresh.title_index
+    assert sorted(updated.graph.edges()) == sorted(fresh.graph.edges())
+
+
+def test_update_without_changes(roam_db):
+    collection = RoamGraph(roam_db)
+    assert collection.update() == set()
+
+
+def test_update_changed_file(roam_db):
+    execute(
+        roam_db,
+        ("""INSERT INTO links VALUES (0, '"lonely"', '"group"', '"id"', '()')""",),
+    )
+    collection = RoamGraph(roam_db)
+    fname = collection.node("ring").fname
+
+    execute(
+        roam_db,
+        ("""UPDATE files SET hash = '"new"' WHERE file = ?""", (f'"{fname}"',)),
+        ("""DELETE FROM nodes WHERE id = '"ring"'""",),
+        ("""DELETE FROM links WHERE source = '"ring"'""",),
+        (
+            """INSERT INTO nodes (id, file, level, pos, title)
+               VALUES ('"field"', ?, 1, 1, '"Field"')""",
+            (f'"{fname}"',),
+        ),
+        ("""INSERT INTO links VALUES (0, '"field"', '"group"', '"id"', '()')""",),
+    )
+
+    assert collection.update() == {fname}
+    assert "ring" not in collection.IDs
+    assert collection.node("lonely").backlinks == ["lonely", "group"]
+    assert collection.in_degree("group") == 3
+    assert_same_collection(collection, RoamGraph(roam_db))
+
+
+def test_update_added_and_deleted_files(roam_db):
+    collection = RoamGraph(roam_db)
+    lonely = collection.node("lonely").fname
+
+    execute(
+        roam_db,
+        ("""DELETE FROM files WHERE file = ?""", (f'"{lonely}"',)),
+        ("""DELETE FROM nodes WHERE file = ?""", (f'"{lonely}"',)),
+        ("""INSERT INTO files VALUES ('"/topology.org"', '"Topology"', '"h"', '', '')""",),
+        (
+            """INSERT INTO nodes (id, file, level, pos, title)
+               VALUES ('"space"', '"/topology.org"', 0, 1, '"Space"')""",
+        ),
+        ("""INSERT INTO tags VALUES ('"space"', '"math"')""",),
+        ("""INSERT INTO links VALUES (0, '"space"', '"ring"', '"id"', '()')""",),
+    )
+
+    assert collection.update() == {lonely, "/topology.org"}
+    assert collection.node("space").tags == {"math"}
+    assert collection._is_connected
+    assert_same_collection(collection, RoamGraph(roam_db))
+
+
+def test_update_refuses_derived_collections(roam_db):
+    filtered = RoamGraph(roam_db).filter_tags(["definition"])
+
+    with pytest.raises(ValueError):
+        filtered.update()
+
+
+def test_update_removes_orphans_again(roam_db):
+    collection = RoamGraph(roam_db)
+    lonely = collection.node("lonely").fname
+    collection.remove_orphans()
+
+    execute(
+        roam_db,
+        ("""UPDATE files SET hash = '"new"' WHERE file = ?""", (f'"{lonely}"',)),
+        (
+            """INSERT INTO nodes (id, file, level, pos, title)
+               VALUES ('"field"', ?, 1, 1, '"Field"')""",
+            (f'"{lonely}"',),
+        ),
+    )
+
+    assert collection.update() == {lonely}
+    assert "field" not in collection.IDs
+    assert "lonely" not in collection.IDs
+    assert collection._is_connected
+
+
+def test_update_brings_back_orphans_linked_to(roam_db):
+    collection = RoamGraph(roam_db)
+    collection.remove_orphans()
+    fname = collection.node("ring").fname
+
+    execute(
+        roam_db,
+        ("""UPDATE files SET hash = '"new"' WHERE file = ?""", (f'"{fname}"',)),
+        """INSERT INTO links VALUES (0, '"ring"', '"lonely"', '"id"', '()')""",
+    )
+
+    assert collection.update() == {fname}
+    assert "lonely" in collection.IDs
+    assert_same_collection(collection, RoamGraph(roam_db).remove_orphans())